@@ -0,0 +1,87 @@
+# Generates the stubs and skeletons of IDL files with the packaged tao_idl.
+#
+#   tao_idl_generate(<variable> <idl file>...
+#                    [OUTPUT_DIRECTORY <directory>]
+#                    [INCLUDE_DIRECTORIES <directory>...]
+#                    [FLAGS <flag>...])
+#
+# Sets <variable> to the generated *C.cpp and *S.cpp files, to be added to
+# the sources of a target. The generated headers are written to
+# OUTPUT_DIRECTORY, by default the current binary directory.
+#
+# The output of tao_idl is cached in TAO_IDL_CACHE_DIR, keyed by a hash of
+# tao_idl, the flags, the include directories and the content of the IDL
+# file and of the IDL files it includes. Generated files that are unchanged
+# keep their timestamps, so regenerating them recompiles nothing.
+
+include_guard(GLOBAL)
+
+# TaoIdlCache.cmake uses features of CMake 3.19.
+if(CMAKE_VERSION VERSION_LESS 3.19)
+  message(FATAL_ERROR "tao_idl_generate() needs CMake 3.19 or newer, found ${CMAKE_VERSION}")
+endif()
+
+get_filename_component(_tao_idl_package_folder "${CMAKE_CURRENT_LIST_DIR}/../../.." ABSOLUTE)
+set(_tao_idl_cache_script "${CMAKE_CURRENT_LIST_DIR}/TaoIdlCache.cmake")
+
+find_program(TAO_IDL_EXECUTABLE tao_idl HINTS "${_tao_idl_package_folder}/bin")
+set(TAO_IDL_CACHE_DIR "$ENV{HOME}/.cache/ace+tao/idl"
+    CACHE PATH "Folder caching the files generated by tao_idl")
+
+function(tao_idl_generate variable)
+  cmake_parse_arguments(PARSE_ARGV 1 arg "" "OUTPUT_DIRECTORY" "INCLUDE_DIRECTORIES;FLAGS")
+  if(NOT TAO_IDL_EXECUTABLE)
+    message(FATAL_ERROR "tao_idl not found in ${_tao_idl_package_folder}/bin")
+  endif()
+  if(NOT arg_OUTPUT_DIRECTORY)
+    set(arg_OUTPUT_DIRECTORY "${CMAKE_CURRENT_BINARY_DIR}")
+  endif()
+  set(include_directories ${arg_INCLUDE_DIRECTORIES} "${_tao_idl_package_folder}/include")
+
+  # A shared tao_idl loads the libraries of this package and, for the layered
+  # packages, of the ace package.
+  set(library_path "${_tao_idl_package_folder}/lib")
+  foreach(config IN LISTS CMAKE_BUILD_TYPE CMAKE_CONFIGURATION_TYPES)
+    string(TOUPPER "${config}" config)
+    if(ace_PACKAGE_FOLDER_${config})
+      list(APPEND library_path "${ace_PACKAGE_FOLDER_${config}}/lib")
+    endif()
+  endforeach()
+
+  set(sources)
+  foreach(idl IN LISTS arg_UNPARSED_ARGUMENTS)
+    get_filename_component(idl "${idl}" ABSOLUTE)
+    get_filename_component(name "${idl}" NAME_WE)
+    set(prefix "${arg_OUTPUT_DIRECTORY}/${name}")
+    set(stamp "${prefix}.idl.stamp")
+    set(depfile)
+    if(CMAKE_GENERATOR MATCHES "Ninja" OR CMAKE_VERSION VERSION_GREATER_EQUAL 3.20)
+      # Reruns the command when an included IDL file changes.
+      set(depfile DEPFILE "${stamp}.d")
+    endif()
+    add_custom_command(
+      OUTPUT "${stamp}"
+      BYPRODUCTS "${prefix}C.h" "${prefix}C.inl" "${prefix}C.cpp" "${prefix}S.h" "${prefix}S.cpp"
+      COMMAND "${CMAKE_COMMAND}"
+              "-DTAO_IDL=${TAO_IDL_EXECUTABLE}"
+              "-DIDL=${idl}"
+              "-DOUTPUT_DIRECTORY=${arg_OUTPUT_DIRECTORY}"
+              "-DCACHE_DIR=${TAO_IDL_CACHE_DIR}"
+              "-DINCLUDE_DIRECTORIES=${include_directories}"
+              "-DFLAGS=${arg_FLAGS}"
+              "-DLIBRARY_PATH=${library_path}"
+              "-DTAO_ROOT=${_tao_idl_package_folder}/include"
+              "-DSTAMP=${stamp}"
+              -P "${_tao_idl_cache_script}"
+      DEPENDS "${idl}" "${_tao_idl_cache_script}"
+      ${depfile}
+      COMMENT "Generating stubs and skeletons of ${name}.idl"
+      VERBATIM)
+    # The stamp brings the command into the target in every generator.
+    list(APPEND sources "${stamp}" "${prefix}C.cpp")
+    if(NOT "-SS" IN_LIST arg_FLAGS)
+      list(APPEND sources "${prefix}S.cpp")
+    endif()
+  endforeach()
+  set(${variable} ${sources} PARENT_SCOPE)
+endfunction()
@@ -0,0 +1,82 @@
+# Script run by tao_idl_generate() for an IDL file:
+#
+#   cmake -DTAO_IDL=... -DIDL=... -DOUTPUT_DIRECTORY=... -DCACHE_DIR=...
+#         -DINCLUDE_DIRECTORIES=... -DFLAGS=... -DLIBRARY_PATH=...
+#         -DTAO_ROOT=... -DSTAMP=... -P TaoIdlCache.cmake
+#
+# Runs tao_idl only when CACHE_DIR holds no output for the same inputs, and
+# copies the output to OUTPUT_DIRECTORY where it differs.
+
+cmake_minimum_required(VERSION 3.19)
+
+# Collects the IDL file and the files it includes, transitively.
+set(inputs)
+set(pending "${IDL}")
+set(key_input "tao_idl\n")
+file(SHA256 "${TAO_IDL}" tao_idl_hash)
+get_filename_component(name "${IDL}" NAME)
+string(APPEND key_input "${tao_idl_hash}\n${FLAGS}\n${INCLUDE_DIRECTORIES}\n${name}\n")
+while(pending)
+  list(POP_FRONT pending file)
+  if(file IN_LIST inputs)
+    continue()
+  endif()
+  list(APPEND inputs "${file}")
+  file(SHA256 "${file}" hash)
+  string(APPEND key_input "${hash}\n")
+  get_filename_component(directory "${file}" DIRECTORY)
+  file(STRINGS "${file}" includes REGEX "^[ \t]*#[ \t]*include")
+  foreach(include IN LISTS includes)
+    if(NOT include MATCHES "[<\"]([^>\"]+)[>\"]")
+      continue()
+    endif()
+    set(included "${CMAKE_MATCH_1}")
+    foreach(include_directory IN ITEMS "${directory}" ${INCLUDE_DIRECTORIES})
+      if(EXISTS "${include_directory}/${included}")
+        get_filename_component(included "${include_directory}/${included}" ABSOLUTE)
+        list(APPEND pending "${included}")
+        break()
+      endif()
+    endforeach()
+  endforeach()
+endwhile()
+string(SHA256 key "${key_input}")
+
+set(entry "${CACHE_DIR}/${key}")
+if(EXISTS "${entry}")
+  message(STATUS "tao_idl: ${name} cached")
+else()
+  string(RANDOM LENGTH 8 suffix)
+  set(staging "${entry}.${suffix}")
+  file(MAKE_DIRECTORY "${staging}")
+  set(include_flags)
+  foreach(include_directory IN LISTS INCLUDE_DIRECTORIES)
+    list(APPEND include_flags "-I${include_directory}")
+  endforeach()
+  string(REPLACE ";" ":" library_path "${LIBRARY_PATH}")
+  # TAO_ROOT points tao_idl to orb.idl and the other IDL files of TAO.
+  execute_process(
+    COMMAND "${CMAKE_COMMAND}" -E env "LD_LIBRARY_PATH=${library_path}:$ENV{LD_LIBRARY_PATH}"
+            "TAO_ROOT=${TAO_ROOT}" "${TAO_IDL}" ${FLAGS} ${include_flags} -o "${staging}" "${IDL}"
+    RESULT_VARIABLE result)
+  if(NOT result EQUAL 0)
+    file(REMOVE_RECURSE "${staging}")
+    message(FATAL_ERROR "tao_idl failed on ${IDL}")
+  endif()
+  # Another build may have stored the same entry meanwhile, either is fine.
+  execute_process(COMMAND "${CMAKE_COMMAND}" -E rename "${staging}" "${entry}" ERROR_QUIET)
+  file(REMOVE_RECURSE "${staging}")
+  message(STATUS "tao_idl: ${name} generated")
+endif()
+
+file(GLOB generated "${entry}/*")
+execute_process(COMMAND "${CMAKE_COMMAND}" -E copy_if_different ${generated} "${OUTPUT_DIRECTORY}"
+                COMMAND_ERROR_IS_FATAL ANY)
+file(TOUCH "${STAMP}")
+
+set(dependencies)
+foreach(input IN LISTS inputs)
+  string(REPLACE " " "\\ " input "${input}")
+  string(APPEND dependencies " ${input}")
+endforeach()
+file(WRITE "${STAMP}.d" "${STAMP}:${dependencies}\n")
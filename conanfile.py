@@ -1,12 +1,45 @@
 from conan import ConanFile
-from conan.tools.files import chdir, check_md5, get, save, unzip
+from conan.errors import ConanException, ConanInvalidConfiguration
+from conan.tools.build import can_run
+from conan.tools.files import chdir, copy, download, rmdir, save
 from conan.tools.gnu import AutotoolsDeps, AutotoolsToolchain, Autotools
 from conan.tools.env import Environment
 
+from io import StringIO
+import hashlib
+import json
 import os
+import re
+import shutil
+import socket
+import tarfile
+
+# File wrapper feeding everything read through it into hash objects.
+class _DigestReader:
+
+  def __init__(self, f, digests):
+    self._f = f
+    self._digests = digests
+
+  def read(self, size=-1):
+    data = self._f.read(size)
+    for digest in self._digests:
+      digest.update(data)
+    return data
+
+# Extracts a member of a tarball that is not trusted yet. Without the data
+# filter of tarfile, absolute paths, paths leaving the folder, links and
+# device files are rejected here.
+def _extract_member(tarball, member, path):
+  if hasattr(tarfile, "data_filter"):
+    tarball.extract(member, path, filter="data")
+    return
+  name = os.path.normpath(member.name)
+  if os.path.isabs(name) or name.split(os.sep)[0] == ".." or not (member.isfile() or member.isdir()):
+    raise ConanException(f"Refusing to extract {member.name}")
+  tarball.extract(member, path)
 
 class Log4cppConan(ConanFile):
-  name = "ace+tao"
   version = "7.0.9"
   license = "DOC"
   author = "Holger Detering <freelance@detering-springhoe.de>"
@@ -23,383 +56,925 @@ of a CORBA 3.x-compliant ORB that supports real-time extensions.
   topics = ("c++", "CORBA")
   settings = "os", "compiler", "build_type", "arch"
   options = {
+      "compiler_cache": [None, "ccache", "sccache"],
+      "components": [None, "ANY"],
+      "fPIC": [True, False],
+      "linker_tuning": [True, False],
+      "optimization": [None, "lto", "pgo"],
+      "profile": ["default", "performance", "footprint"],
+      "profiling": [None, "frame_pointers", "debug_info"],
+      "shared": [True, False],
+      "svc_conf": [None, "single_threaded", "thread_pool", "leader_followers", "csd_thread_pool"],
+      "threads": [True, False],
       "with_bzip2": [True, False],
+      "with_lzo": [True, False],
       "with_xerces": [True, False],
       "with_zlib": [True, False]
       }
   default_options = {
+      "compiler_cache": None,
+      "components": None,
+      "fPIC": True,
+      "linker_tuning": False,
+      "optimization": None,
+      "profile": "default",
+      "profiling": None,
+      "shared": True,
+      "svc_conf": None,
+      "threads": True,
       "with_bzip2": False,
+      "with_lzo": False,
       "with_xerces": False,
       "with_zlib": False
       }
-  exports_sources = f"sources/ACE+TAO-src-{version}.tar.bz2"
-  package_type = "shared-library"
+  exports_sources = f"sources/ACE+TAO-src-{version}.tar.bz2", "cmake/*", "pgo/*", "svc_conf/*"
+  package_type = "library"
+
+  # The svc.conf presets and the component providing the services they load.
+  _svc_conf_presets = {
+      "single_threaded": "TAO_Strategies",
+      "thread_pool": "TAO_Strategies",
+      "leader_followers": "TAO",
+      "csd_thread_pool": "TAO_CSD_ThreadPool"
+      }
+  # Subtrees of the tarball that are not part of the TAO_ACE.mwc workspace.
+  _unused_source_trees = (
+      "ACE_wrappers/docs/",
+      "ACE_wrappers/examples/",
+      "ACE_wrappers/html/",
+      "ACE_wrappers/performance-tests/",
+      "ACE_wrappers/tests/",
+      "ACE_wrappers/ACEXML/examples/",
+      "ACE_wrappers/ACEXML/tests/",
+      "ACE_wrappers/Kokyu/tests/",
+      "ACE_wrappers/protocols/examples/",
+      "ACE_wrappers/protocols/tests/",
+      "ACE_wrappers/TAO/DevGuideExamples/",
+      "ACE_wrappers/TAO/docs/",
+      "ACE_wrappers/TAO/examples/",
+      "ACE_wrappers/TAO/interop-tests/",
+      "ACE_wrappers/TAO/performance-tests/",
+      "ACE_wrappers/TAO/tests/",
+      "ACE_wrappers/TAO/orbsvcs/DevGuideExamples/",
+      "ACE_wrappers/TAO/orbsvcs/examples/",
+      "ACE_wrappers/TAO/orbsvcs/performance-tests/",
+      "ACE_wrappers/TAO/orbsvcs/tests/"
+      )
+  _mwc_command = "$ACE_ROOT/bin/mwc.pl TAO_ACE.mwc -type gnuace"
+  # Tools of the workspace that building the TAO libraries relies on, in
+  # build order, and the layer packaging them.
+  _mpc_tools = {
+      "ace_gperf": "ace",
+      "TAO_IDL_FE": "tao",
+      "TAO_IDL_BE": "tao",
+      "tao_idl": "tao"
+      }
+  # Packages the recipe creates when called with --name instead of the
+  # complete ace+tao, from the bottom layer up. Each one packages a layer of
+  # the libraries and requires the packages of the layers below.
+  _layers = ("ace", "tao", "tao-orbsvcs")
+
+  @property
+  def _layer(self):
+    return str(self.name) if self.name in self._layers else None
+
+  @property
+  def _lower_layers(self):
+    return self._layers[:self._layers.index(self._layer)] if self._layer else ()
+
+  def _component_layer(self, name):
+    if name.startswith(("ACE", "Kokyu")):
+      return "ace"
+    if re.match(r"TAO_(Cos|Ds|ETCL|FaultTolerance|FT|PortableGroup|RTEvent|Svc_Utils)", name):
+      return "tao-orbsvcs"
+    return "tao"
+
+  @property
+  def _ace_root(self):
+    return os.path.join(self.source_folder, "ACE_wrappers")
+
+  @property
+  def _tao_root(self):
+    return os.path.join(self._ace_root, "TAO")
+
+  @property
+  def _components(self):
+    components = {
+        "ACE_ETCL_Parser": ["ACE_ETCL"],
+        "ACE_ETCL": ["ACE"],
+        "ACE_HTBP": ["ACE"],
+        "ACE_INet": ["ACE"],
+        "ACE_Monitor_Control": ["ACE_ETCL_Parser"],
+        "ACE": [],
+        "ACE_RMCast": ["ACE"],
+        "ACE_TMCast": ["ACE"],
+        "ACEXML_Parser": ["ACEXML"],
+        "ACEXML": ["ACE"],
+        "ACEXML_XML_Svc_Conf_Parser": ["ACEXML_Parser"],
+        "Kokyu": ["ACE"],
+        "TAO_AnyTypeCode": ["TAO"],
+        "TAO_Async_IORTable": ["TAO", "TAO_IORTable"],
+        "TAO_BiDirGIOP": ["TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        "TAO_CodecFactory": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_Codeset": ["TAO"],
+        "TAO_Compression": ["TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        "TAO_CosConcurrency": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_CosConcurrency_Serv": ["TAO_CosConcurrency_Skel"],
+        "TAO_CosConcurrency_Skel": ["TAO_CosConcurrency", "TAO_PortableServer"],
+        "TAO_CosEvent": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_CosEvent_Serv": ["TAO_CosEvent_Skel", "TAO_DynamicInterface", "TAO_IFR_Client", "TAO_Messaging", "TAO_CosNaming", "TAO_Svc_Utils"],
+        "TAO_CosEvent_Skel": ["TAO_CosEvent", "TAO_PortableServer"],
+        "TAO_CosLifeCycle": ["TAO_CosNaming", "TAO_AnyTypeCode", "TAO"],
+        "TAO_CosLifeCycle_Skel": ["TAO_CosLifeCycle", "TAO_PortableServer"],
+        "TAO_CosLoadBalancing": ["TAO_CosNaming", "TAO_IORManip", "TAO_PortableGroup", "TAO"],
+        "TAO_CosNaming": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_CosNaming_Serv": ["TAO_CosNaming_Skel", "TAO_Messaging", "TAO_Svc_Utils", "TAO_IORTable"],
+        "TAO_CosNaming_Skel": ["TAO_CosNaming", "TAO_PortableServer"],
+        "TAO_CosNotification": ["TAO_CosEvent", "TAO"],
+        "TAO_CosNotification_Serv": ["TAO_CosNotification_Skel", "TAO_Svc_Utils", "TAO_DynamicAny", "TAO_ETCL"],
+        "TAO_CosNotification_Skel": ["TAO_CosNotification", "TAO_CosEvent_Skel", "TAO_PortableServer"],
+        "TAO_CosProperty": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_CosProperty_Serv": ["TAO_CosProperty_Skel"],
+        "TAO_CosProperty_Skel": ["TAO_CosProperty", "TAO_PortableServer"],
+        "TAO_CosTime": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_CosTime_Serv": ["TAO_CosTime_Skel", "TAO_Svc_Utils"],
+        "TAO_CosTime_Skel": ["TAO_CosTime", "TAO_PortableServer"],
+        "TAO_CosTrading": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_CosTrading_Serv": ["TAO_CosTrading_Skel", "TAO_Svc_Utils", "TAO_DynamicAny"],
+        "TAO_CosTrading_Skel": ["TAO_CosTrading", "TAO_PortableServer"],
+        "TAO_CSD_Framework": ["TAO_PortableServer", "TAO_PI", "TAO"],
+        "TAO_CSD_ThreadPool": ["TAO_CSD_Framework"],
+        "TAO_DiffServPolicy": ["TAO_PI", "TAO_PortableServer", "TAO"],
+        "TAO_DsEventLogAdmin": ["TAO", "TAO_DsLogAdmin", "TAO_CosEvent"],
+        "TAO_DsEventLogAdmin_Serv": ["TAO_DsEventLogAdmin_Skel", "TAO_DsLogAdmin_Serv", "TAO_CosEvent_Serv"],
+        "TAO_DsEventLogAdmin_Skel": ["TAO_DsEventLogAdmin", "TAO_DsLogAdmin_Skel", "TAO_CosEvent_Skel", "TAO_PortableServer"],
+        "TAO_DsLogAdmin": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_DsLogAdmin_Serv": ["TAO_DsLogAdmin_Skel", "TAO_DynamicAny", "TAO_ETCL", "TAO_Svc_Utils"],
+        "TAO_DsLogAdmin_Skel": ["TAO_DsLogAdmin", "TAO_PortableServer"],
+        "TAO_DsNotifyLogAdmin": ["TAO_DsEventLogAdmin", "TAO_DsLogAdmin", "TAO_CosNotification", "TAO_CosEvent", "TAO"],
+        "TAO_DsNotifyLogAdmin_Serv": ["TAO_DsNotifyLogAdmin_Skel", "TAO_DsLogAdmin_Serv"],
+        "TAO_DsNotifyLogAdmin_Skel": ["TAO_DsNotifyLogAdmin", "TAO_DsEventLogAdmin_Skel", "TAO_DsLogAdmin_Skel", "TAO_CosNotification_Skel", "TAO_CosEvent_Skel", "TAO_PortableServer"],
+        "TAO_DynamicAny": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_DynamicInterface": ["TAO_Messaging", "TAO_PI", "TAO_CodecFactory", "TAO_PortableServer", "TAO_Valuetype", "TAO_AnyTypeCode", "TAO"],
+        "TAO_EndpointPolicy": ["TAO_PI", "TAO_PortableServer", "TAO"],
+        "TAO_ETCL": ["ACE_ETCL"],
+        "TAO_FaultTolerance": ["TAO_FT_ServerORB", "TAO_FT_ClientORB", "TAO_CosNotification"],
+        "TAO_FT_ClientORB": ["TAO_FTORB_Utils", "TAO_Messaging", "TAO_PortableGroup"],
+        "TAO_FTORB_Utils": ["TAO_IORManip", "TAO_PortableServer", "TAO"],
+        "TAO_FT_ServerORB": ["TAO_FTORB_Utils", "TAO_Messaging", "TAO_PortableGroup"],
+        "TAO_IFR_Client": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_ImR_Client": ["TAO_PortableServer", "TAO_AnyTypeCode", "TAO"],
+        "TAO_IORInterceptor": ["TAO_PI", "TAO_CodecFactory", "TAO_ObjRefTemplate", "TAO_Valuetype", "TAO_PortableServer", "TAO_AnyTypeCode", "TAO"],
+        "TAO_IORManip": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_IORTable": ["TAO"],
+        "TAO_Messaging": ["TAO_Valuetype", "TAO_PI", "TAO_CodecFactory", "TAO_PortableServer", "TAO_AnyTypeCode", "TAO"],
+        "TAO_Monitor": ["TAO_PortableServer", "ACE_Monitor_Control"],
+        "TAO_ObjRefTemplate": ["TAO_PortableServer", "TAO_Valuetype", "TAO_AnyTypeCode", "TAO"],
+        "TAO": ["ACE"],
+        "TAO_PI": ["TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        "TAO_PI_Server": ["TAO_PortableServer", "TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        "TAO_PortableGroup": ["TAO_CosNaming", "TAO_IORManip", "TAO_Messaging", "TAO"],
+        "TAO_PortableServer": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_RLECompressor": ["TAO_Compression"],
+        "TAO_RTCORBA": ["TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        "TAO_RTEventLogAdmin": ["TAO", "TAO_DsLogAdmin", "TAO_RTEvent"],
+        "TAO_RTEventLogAdmin_Serv": ["TAO_RTEventLogAdmin_Skel", "TAO_DsLogAdmin_Serv", "TAO_RTEvent_Serv"],
+        "TAO_RTEventLogAdmin_Skel": ["TAO_RTEventLogAdmin", "TAO_DsLogAdmin_Skel", "TAO_RTEvent_Skel", "TAO_PortableServer"],
+        "TAO_RTEvent": ["TAO_Svc_Utils", "TAO_AnyTypeCode", "TAO"],
+        "TAO_RTEvent_Serv": ["TAO_RTEvent_Skel", "TAO_Svc_Utils", "TAO_Messaging"],
+        "TAO_RTEvent_Skel": ["TAO_RTEvent", "TAO_PortableServer"],
+        "TAO_RTPortableServer": ["TAO_PortableServer", "TAO_RTCORBA", "TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        "TAO_RTScheduler": ["TAO_PI_Server", "TAO_PortableServer", "TAO_RTCORBA", "TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        "TAO_SmartProxies": ["TAO"],
+        "TAO_Strategies": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_Svc_Utils": ["TAO_PortableServer"],
+        "TAO_TypeCodeFactory": ["TAO_IFR_Client", "TAO_AnyTypeCode", "TAO"],
+        "TAO_Utils": ["TAO_PI", "TAO_CodecFactory", "TAO_PortableServer", "TAO_AnyTypeCode", "TAO"],
+        "TAO_Valuetype": ["TAO_AnyTypeCode", "TAO"],
+        "TAO_ZIOP": ["TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"],
+        }
+    if self.options.with_bzip2:
+      components["ACE"].append("bzip2::bzip2")
+      components["TAO_Bzip2Compressor"] = ["TAO_Compression", "bzip2::bzip2"]
+    if self.options.with_lzo:
+      components["TAO_LzoCompressor"] = ["TAO_Compression", "lzo::lzo"]
+    if self.options.with_xerces:
+      components["ACE"].append("xerces-c::xerces-c")
+      components["ACE_XML_Utils"] = ["ACE", "xerces-c::xerces-c"]
+    if self.options.with_zlib:
+      components["ACE"].append("zlib::zlib")
+      components["TAO_ZlibCompressor"] = ["TAO_Compression", "zlib::zlib"]
+    removed = set()
+    if not self.options.threads:
+      # Without thread support there are no thread pools and no reliable
+      # multicast, and no libraries built on them.
+      removed |= {"ACE_RMCast", "ACE_TMCast", "TAO_CSD_ThreadPool", "TAO_RTCORBA"}
+    if self.options.profile in ("performance", "footprint"):
+      # The profiles disable the monitor framework, which leaves the monitor
+      # libraries empty.
+      removed |= {"ACE_Monitor_Control", "TAO_Monitor"}
+    dependents = removed
+    while dependents:
+      dependents = {name for name, requires in components.items()
+                    if name not in removed and removed.intersection(requires)}
+      removed |= dependents
+    components = {name: requires for name, requires in components.items() if name not in removed}
+    return components
+
+  @property
+  def _requested_components(self):
+    return [c.strip() for c in str(self.options.components).split(";") if c.strip()]
+
+  @property
+  def _required_components(self):
+    components = self._components
+    if not self.options.components:
+      return list(components)
+    selected = set()
+    pending = list(self._requested_components)
+    while pending:
+      name = pending.pop()
+      # validate() reports the unknown names.
+      if name in selected or name not in components:
+        continue
+      selected.add(name)
+      pending.extend(components[name])
+    return [name for name in components if name in selected]
+
+  @property
+  def _selected_components(self):
+    # The required components that this package contains.
+    return [name for name in self._required_components
+            if self._layer is None or self._component_layer(name) == self._layer]
+
+  def _mpc_projects(self):
+    # Maps the projects of the generated workspace to their directory and to
+    # the projects they are built after, as the workspace makefile lists them.
+    projects = {}
+    with open(os.path.join(self._tao_root, "GNUmakefile")) as f:
+      lines = f.read().splitlines()
+    for rule, recipe in zip(lines, lines[1:]):
+      target = re.match(r"^([^\s:.][^\s:]*):(.*)$", rule)
+      command = re.search(r"(?:cd (\S+) && )?\$\(MAKE\) -f GNUmakefile\.(\S+)", recipe)
+      if target and command and recipe.startswith("\t") and command.group(2) == target.group(1):
+        directory = os.path.normpath(os.path.join(self._tao_root, command.group(1) or "."))
+        projects[target.group(1)] = (directory, target.group(2).split())
+    return projects
+
+  def _project_output(self, directory, project):
+    # The library or executable a project builds, None for the projects that
+    # only generate code, like the IDL projects.
+    with open(os.path.join(directory, f"GNUmakefile.{project}")) as f:
+      match = re.search(r"^(?:LIB_NAME\s*=\s*lib|BIN_UNCHECKED\s*=\s*)(\S+)", f.read(), re.MULTILINE)
+    return match.group(1) if match else None
+
+  def _project_layer(self, directory, output):
+    if output in self._components:
+      return self._component_layer(output)
+    path = os.path.relpath(directory, self._ace_root).replace(os.sep, "/") + "/"
+    if path.startswith("TAO/orbsvcs/"):
+      return "tao-orbsvcs"
+    return "tao" if path.startswith("TAO/") else "ace"
+
+  def _selected_projects(self):
+    # The projects building the selected components and tools, with the
+    # projects of this layer they are built after, such as the IDL projects
+    # generating their stubs, in build order. The lower layers come from the
+    # dependencies.
+    projects = self._mpc_projects()
+    outputs = {}
+    layers = {}
+    for project, (directory, _) in projects.items():
+      output = self._project_output(directory, project)
+      if output:
+        outputs[output] = project
+      layers[project] = self._project_layer(directory, output)
+    tools = [tool for tool, layer in self._mpc_tools.items() if self._layer in (None, layer)]
+    ordered = []
+
+    def visit(project):
+      if project in ordered or self._layer not in (None, layers[project]):
+        return
+      for prerequisite in projects[project][1]:
+        if prerequisite in projects:
+          visit(prerequisite)
+      ordered.append(project)
+
+    for name in self._selected_components + tools:
+      if name in outputs:
+        visit(outputs[name])
+      else:
+        self.output.warning(f"No MPC project builds {name}, skipping it")
+    return [(projects[project][0], project) for project in ordered]
+
+  def _cache_folder(self, kind):
+    cache_folder = self.conf.get("user.ace_tao:cache_folder",
+                                 default=os.path.join(os.path.expanduser("~"), ".cache", "ace+tao"))
+    return os.path.join(cache_folder, kind)
+
+  def _source_files(self):
+    files = {}
+    for root, _, names in os.walk(self._ace_root):
+      for name in names:
+        path = os.path.join(root, name)
+        files[path] = os.stat(path).st_mtime_ns
+    return files
+
+  def _generate_makefiles(self, features):
+    # The generated makefiles only depend on the sources, the features and
+    # the settings, so they are cached under a key derived from those.
+    key = hashlib.sha256(json.dumps({
+        "version": str(self.version),
+        "features": features,
+        "settings": {k: str(v) for k, v in self.settings.items()},
+        "command": self._mwc_command
+        }, sort_keys=True).encode()).hexdigest()
+    cache_file = os.path.join(self._cache_folder("mpc"), f"{key}.tar.gz")
+    if os.path.isfile(cache_file):
+      self.output.info(f"MPC cache hit ({key}), reusing generated makefiles")
+      # The cache folder is shared, so its archives are not trusted either.
+      with tarfile.open(cache_file) as cache:
+        for member in cache:
+          _extract_member(cache, member, self._ace_root)
+      return
+    self.output.info(f"MPC cache miss ({key}), running mwc.pl")
+    before = self._source_files()
+    with chdir(self, self._tao_root):
+      self.run(self._mwc_command)
+    generated = [path for path, mtime in self._source_files().items() if before.get(path) != mtime]
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    partial_file = f"{cache_file}.{os.getpid()}"
+    with tarfile.open(partial_file, "w:gz") as cache:
+      for path in generated:
+        cache.add(path, arcname=os.path.relpath(path, self._ace_root))
+    os.replace(partial_file, cache_file)
+
+  @property
+  def _ccache_stats_log(self):
+    return os.path.join(self.build_folder, "ccache_stats.log")
+
+  def _compiler_cache_env(self, env):
+    # The statistics come from this build only, not from the cache folder
+    # that other builds share: ccache logs the result of every compile of
+    # the build, and sccache runs a server of its own.
+    cache_folder = self.conf.get("user.ace_tao:compiler_cache_folder",
+                                 default=self._cache_folder(str(self.options.compiler_cache)))
+    if self.options.compiler_cache == "ccache":
+      env.define("CCACHE_DIR", cache_folder)
+      env.define("CCACHE_STATSLOG", self._ccache_stats_log)
+      # Makes the cache entries independent of the build folder.
+      env.define("CCACHE_BASEDIR", self.build_folder)
+    else:
+      env.define("SCCACHE_DIR", cache_folder)
+      env.define("SCCACHE_BASEDIRS", self.build_folder)
+      with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        env.define("SCCACHE_SERVER_PORT", str(s.getsockname()[1]))
+
+  def _reset_compiler_cache_stats(self):
+    if self.options.compiler_cache == "ccache":
+      save(self, self._ccache_stats_log, "")
+    else:
+      self.run("sccache --zero-stats", stdout=StringIO())
+
+  def _compiler_cache_stats(self):
+    if self.options.compiler_cache == "ccache":
+      with open(self._ccache_stats_log) as f:
+        results = [line.strip() for line in f if not line.startswith("#")]
+      hits = results.count("direct_cache_hit") + results.count("preprocessed_cache_hit")
+      misses = results.count("cache_miss")
+    else:
+      output = StringIO()
+      self.run("sccache --show-stats --stats-format=json", stdout=output)
+      self.run("sccache --stop-server", stdout=StringIO())
+      stats = json.loads(output.getvalue())["stats"]
+      hits = sum(stats["cache_hits"]["counts"].values())
+      misses = sum(stats["cache_misses"]["counts"].values())
+    return hits, misses
+
+  def _write_config(self):
+    config = f"""\
+#define ACE_TAO_PACKAGE_PROFILE "{self.options.profile}"
+"""
+    if self.options.profile == "performance":
+      # ACE_NTRACE is 1 by default already. ACE_NLOGGING would compile out
+      # ACE_ERROR along with ACE_DEBUG, so the debug output is left to the
+      # priority mask of ACE_LOG_MSG and the debug levels instead.
+      config += """\
+#define ACE_NDEBUG 1
+#define ACE_HAS_MONITOR_FRAMEWORK 0
+"""
+    elif self.options.profile == "footprint":
+      # Completes the reductions of the MPC features, and leaves IIOP as the
+      # only protocol.
+      config += """\
+#define TAO_HAS_MINIMUM_CORBA 1
+#define CORBA_E_COMPACT
+#define TAO_HAS_AMI 0
+#define TAO_HAS_AMI_CALLBACK 0
+#define TAO_HAS_AMI_POLLER 0
+#define TAO_HAS_INTERCEPTORS 0
+#define TAO_HAS_UIOP 0
+#define TAO_HAS_SHMIOP 0
+#define TAO_HAS_DIOP 0
+#define TAO_HAS_SCIOP 0
+#define ACE_HAS_MONITOR_FRAMEWORK 0
+"""
+    if not self.options.threads:
+      config += """\
+#define ACE_MT_SAFE 0
+"""
+    # A header left over from an earlier build with profiling does not count.
+    if self.options.profiling and os.path.isfile(self._dtrace_header):
+      config += """\
+#define ACE_HAS_DTRACE 1
+"""
+    config += """\
+#include "ace/config-linux.h"
+"""
+    save(self, os.path.join(self._ace_root, "ace/config.h"), config)
+
+  @property
+  def _dtrace_header(self):
+    return os.path.join(self._ace_root, "ace", "ace_dtrace.h")
+
+  def _generate_probes(self):
+    # The USDT probes of ACE are declared for DTrace; on Linux the dtrace
+    # script of SystemTap generates their header.
+    script = os.path.join(self._ace_root, "ace", "ace_dtrace.d")
+    if not os.path.isfile(script):
+      self.output.warning("ACE declares no DTrace probes, building without them")
+      return
+    self.run(f"dtrace -h -s {script} -o {self._dtrace_header}")
+
+  def _split_debug_info(self):
+    # Moves the debug info of the shared libraries and executables into
+    # .debug folders next to them, found through their .gnu_debuglink, or
+    # drops it for profiling=frame_pointers. Static libraries keep it unless
+    # it is dropped.
+    for folder in (os.path.join(self.package_folder, "lib"), os.path.join(self.package_folder, "bin")):
+      for name in sorted(os.listdir(folder)) if os.path.isdir(folder) else []:
+        path = os.path.join(folder, name)
+        if os.path.islink(path) or not os.path.isfile(path):
+          continue
+        with open(path, "rb") as f:
+          magic = f.read(8)
+        if magic != b"!<arch>\n" and magic[:4] != b"\x7fELF":
+          continue
+        if self.options.profiling == "frame_pointers":
+          self.run(f"objcopy --strip-debug {path}")
+        elif magic[:4] == b"\x7fELF":
+          debug_file = os.path.join(folder, ".debug", f"{name}.debug")
+          os.makedirs(os.path.dirname(debug_file), exist_ok=True)
+          self.run(f"objcopy --only-keep-debug {path} {debug_file}")
+          self.run(f"objcopy --strip-debug --add-gnu-debuglink={debug_file} {path}")
+
+  @property
+  def _pgo_profile_folder(self):
+    return os.path.join(self.build_folder, "pgo-profile")
+
+  def _write_platform_macros(self, pgo_stage=None):
+    clang = self.settings.compiler == "clang"
+    platform_macros = "include $(ACE_ROOT)/include/makeinclude/platform_linux.GNU\n"
+    if self.options.compiler_cache:
+      platform_macros += f"CC := {self.options.compiler_cache} $(CC)\n"
+      platform_macros += f"CXX := {self.options.compiler_cache} $(CXX)\n"
+    if self.options.get_safe("fPIC"):
+      platform_macros += "CCFLAGS += -fPIC\n"
+    if self.options.profile == "footprint":
+      platform_macros += "OCFLAGS := -Os\n"
+    if self.options.get_safe("linker_tuning"):
+      # Binds the calls within a library directly, drops unused DT_NEEDED
+      # entries and resolves the remaining relocations once at load time.
+      # Hidden visibility is the default of ACE's g++ makeinclude already.
+      platform_macros += "LDFLAGS += -Wl,-O1 -Wl,--as-needed -Wl,-Bsymbolic-functions -Wl,-z,now -Wl,--hash-style=gnu\n"
+    if self.options.profiling:
+      # Keeps the optimization of the build and adds the frame pointers
+      # perf walks the stacks with.
+      platform_macros += "CCFLAGS += -g -fno-omit-frame-pointer\n"
+      if str(self.settings.arch) in ("x86", "x86_64"):
+        platform_macros += "CCFLAGS += -mno-omit-leaf-frame-pointer\n"
+    if self.options.optimization:
+      lto = "-flto=thin" if clang else "-flto=auto"
+      platform_macros += f"CCFLAGS += {lto}\nLDFLAGS += {lto}\n"
+      if not self.options.shared:
+        # Archives of LTO objects need the plugin aware archiver.
+        platform_macros += "AR = llvm-ar\n" if clang else "AR = gcc-ar\n"
+    if pgo_stage == "generate":
+      platform_macros += f"CCFLAGS += -fprofile-generate={self._pgo_profile_folder}\n"
+      platform_macros += f"LDFLAGS += -fprofile-generate={self._pgo_profile_folder}\n"
+    elif pgo_stage == "use":
+      if clang:
+        profile = os.path.join(self._pgo_profile_folder, "default.profdata")
+        platform_macros += f"CCFLAGS += -fprofile-use={profile} -Wno-profile-instr-unprofiled\n"
+      else:
+        profile = self._pgo_profile_folder
+        platform_macros += f"CCFLAGS += -fprofile-use={profile} -fprofile-correction -Wno-missing-profile\n"
+      platform_macros += f"LDFLAGS += -fprofile-use={profile}\n"
+    # Every compile and link step logs its project with its start and end
+    # time for the build report.
+    platform_macros += "export ACE_TAO_PROJECT := $(patsubst GNUmakefile.%,%,$(notdir $(firstword $(MAKEFILE_LIST))))\n"
+    platform_macros += f"CC := {self._build_timer} $(CC)\nCXX := {self._build_timer} $(CXX)\n"
+    save(self, os.path.join(self._ace_root, "include/makeinclude/platform_macros.GNU"), platform_macros)
+
+  @property
+  def _build_log(self):
+    return os.path.join(self.build_folder, "build_times.log")
+
+  @property
+  def _build_timer(self):
+    return os.path.join(self.build_folder, "build_timer.sh")
+
+  def _write_build_timer(self):
+    save(self, self._build_timer, f"""\
+#!/bin/sh
+start=$(date +%s.%N)
+"$@"
+status=$?
+echo "${{ACE_TAO_PROJECT:-unknown}} $start $(date +%s.%N)" >> "{self._build_log}"
+exit $status
+""")
+    os.chmod(self._build_timer, 0o755)
+
+  @property
+  def _partial_build(self):
+    # The workspace has projects that do not build without threads, and the
+    # monitor libraries that the profiles leave out.
+    return (bool(self.options.components) or self._layer is not None or not self.options.threads
+            or self.options.profile != "default")
+
+  def _make(self, target=None):
+    autotools = Autotools(self)
+    if not self._partial_build:
+      with chdir(self, self._tao_root):
+        autotools.make(target=target)
+      return
+    # The makefiles of the selected projects run one by one in build order,
+    # so that the workspace does not rebuild the layers provided by the
+    # dependencies.
+    for directory, project in self._selected_projects():
+      with chdir(self, directory):
+        autotools.make(target=target, makefile=f"GNUmakefile.{project}")
+
+  def _train_pgo_profile(self):
+    # Runs GIOP requests and replies over loopback IIOP through the
+    # instrumented libraries to collect the profile for the final build.
+    with chdir(self, os.path.join(self.source_folder, "pgo")):
+      self.run("$ACE_ROOT/bin/mwc.pl -type gnuace")
+      Autotools(self).make()
+      env = Environment()
+      env.prepend_path("LD_LIBRARY_PATH", os.path.join(self._ace_root, "lib"))
+      with env.vars(self).apply():
+        self.run("./pgo_training -ORBCollocation no")
+    if self.settings.compiler == "clang":
+      with chdir(self, self._pgo_profile_folder):
+        self.run("llvm-profdata merge -output=default.profdata *.profraw")
 
   def _fetch_sources(self):
     tarball_name = f"ACE+TAO-src-{self.version}.tar.bz2"
     url = f"https://github.com/DOCGroup/ACE_TAO/releases/download/ACE%2BTAO-{self.version.replace('.', '_')}/" + tarball_name
     # url = f"http://localhost:5555/DOCGroup/ACE_TAO/releases/download/ACE%2BTAO-{self.version.replace('.', '_')}/" + tarball_name
     source_path = os.path.join("sources", tarball_name)
+    downloaded = not os.path.isfile(source_path)
+    if downloaded:
+      source_path = tarball_name
+      download(self, url, source_path, verify=False)
     checksums = self.conan_data["checksums"][self.version][0]
-    if os.path.isfile(source_path):
-      check_md5(self, source_path, checksums["md5"])
-      unzip(self, source_path)
-    else:
-      get(self, url, md5=checksums["md5"], verify=False)
+    digests = {algorithm: hashlib.new(algorithm) for algorithm in ("sha256", "md5") if algorithm in checksums}
+    if not digests:
+      raise ConanException(f"No sha256 or md5 checksum given for {tarball_name}")
+    # The tarball is hashed while it is decompressed, and only the subtrees
+    # the build reads are written to disk. They go to a staging folder that
+    # is moved into place once the checksums match.
+    staging = "ACE_wrappers.staging"
+    rmdir(self, staging)
+    with open(source_path, "rb") as f:
+      reader = _DigestReader(f, list(digests.values()))
+      with tarfile.open(fileobj=reader, mode="r|bz2") as tarball:
+        for member in tarball:
+          if not (member.name + "/").startswith(self._unused_source_trees):
+            _extract_member(tarball, member, staging)
+      while reader.read(1 << 20):
+        pass
+    if downloaded:
+      os.remove(source_path)
+    for algorithm, digest in digests.items():
+      if digest.hexdigest() != checksums[algorithm]:
+        rmdir(self, staging)
+        raise ConanException(f"{algorithm} mismatch for {tarball_name}: "
+                             f"expected {checksums[algorithm]}, got {digest.hexdigest()}")
+    rmdir(self, "ACE_wrappers")
+    os.replace(os.path.join(staging, "ACE_wrappers"), "ACE_wrappers")
+    rmdir(self, staging)
 
   def source(self):
     self._fetch_sources()
-    save(self, "ACE_wrappers/ace/config.h", """\
-#include "ace/config-linux.h"
-""")
-    save(self, "ACE_wrappers/include/makeinclude/platform_macros.GNU", """\
-include $(ACE_ROOT)/include/makeinclude/platform_linux.GNU
-""")
+
+  def set_name(self):
+    self.name = self.name or "ace+tao"
+
+  def configure(self):
+    if self.options.shared:
+      self.options.rm_safe("fPIC")
+    else:
+      # Static libraries are not loaded by the dynamic linker.
+      self.options.rm_safe("linker_tuning")
+    # The libraries the package contains, whatever order they were requested
+    # in. package_id() may not read the options.
+    self._package_components = None
+    if self.options.components:
+      self._package_components = ";".join(sorted(self._selected_components))
+    for layer in self._lower_layers:
+      # Each layer builds only its part of the requested libraries, so that
+      # a change to the libraries above it keeps its package ID.
+      if self.options.components:
+        components = [name for name in self._required_components if self._component_layer(name) == layer]
+        if components:
+          self.options[layer].components = ";".join(components)
+      for option in ("fPIC", "linker_tuning", "optimization", "profile", "profiling", "shared",
+                     "threads", "with_bzip2", "with_lzo", "with_xerces", "with_zlib"):
+        value = self.options.get_safe(option)
+        # Unset options keep the defaults, which are the same in every layer.
+        if value is not None and value.value is not None:
+          setattr(self.options[layer], option, value.value)
+      # The training workload needs TAO, so the ace package gets LTO only.
+      if layer == "ace" and self.options.optimization == "pgo":
+        self.options[layer].optimization = "lto"
 
   def requirements(self):
-    if self.options.with_bzip2:
+    for layer in self._lower_layers:
+      self.requires(f"{layer}/{self.version}", transitive_headers=True)
+    packages = {r.split("::")[0] for c in self._selected_components for r in self._components[c] if "::" in r}
+    if "bzip2" in packages:
       self.requires("bzip2/1.0.8")
-    if self.options.with_xerces:
+    if "lzo" in packages:
+      self.requires("lzo/2.10")
+    if "xerces-c" in packages:
       self.requires("xerces-c/3.2.2")
-    if self.options.with_zlib:
+    if "zlib" in packages:
       self.requires("zlib/1.2.11")
 
+  def validate(self):
+    if self.options.components:
+      unknown = [c for c in self._requested_components if c not in self._components]
+      if unknown:
+        hint = ""
+        if not self.options.threads:
+          hint = " (threads=False leaves out the libraries needing threads)"
+        elif self.options.profile != "default":
+          hint = f" (profile={self.options.profile} leaves out the monitor libraries)"
+        raise ConanInvalidConfiguration(f"Unknown components requested: {', '.join(unknown)}{hint}")
+    if self.options.get_safe("linker_tuning") and self.settings.compiler not in ("gcc", "clang"):
+      raise ConanInvalidConfiguration("linker_tuning needs gcc or clang")
+    if self.options.profiling and self.settings.compiler not in ("gcc", "clang"):
+      raise ConanInvalidConfiguration(f"profiling={self.options.profiling} needs gcc or clang")
+    if self.options.optimization and self.settings.compiler not in ("gcc", "clang"):
+      raise ConanInvalidConfiguration(f"optimization={self.options.optimization} needs gcc or clang")
+    if self.options.optimization == "pgo":
+      if self._layer == "ace":
+        raise ConanInvalidConfiguration("optimization=pgo trains through TAO, the ace package supports lto only")
+      if not can_run(self):
+        raise ConanInvalidConfiguration("optimization=pgo needs to run the training workload on the build machine")
+      if not self.options.threads:
+        raise ConanInvalidConfiguration("optimization=pgo trains with a multi-threaded workload and needs threads=True")
+      if "TAO_PortableServer" not in self._required_components:
+        raise ConanInvalidConfiguration("optimization=pgo needs the TAO_PortableServer component")
+    if self.options.svc_conf:
+      if not self.options.shared:
+        raise ConanInvalidConfiguration("svc_conf presets load services dynamically and need shared=True")
+      if not self.options.threads and self.options.svc_conf != "single_threaded":
+        raise ConanInvalidConfiguration(f"svc_conf={self.options.svc_conf} runs ORB threads and needs threads=True")
+      component = self._svc_conf_presets[str(self.options.svc_conf)]
+      if component not in self._required_components:
+        raise ConanInvalidConfiguration(f"svc_conf={self.options.svc_conf} needs the {component} component")
+
+  def package_id(self):
+    del self.info.options.compiler_cache
+    del self.info.options.svc_conf
+    if self._package_components is not None:
+      self.info.options.components = self._package_components
+    # Only the libraries of the lower layers link the external libraries,
+    # apart from the compressors in the tao package.
+    if self._layer == "ace":
+      del self.info.options.with_lzo
+    elif self._layer == "tao":
+      del self.info.options.with_xerces
+    elif self._layer == "tao-orbsvcs":
+      del self.info.options.with_bzip2
+      del self.info.options.with_lzo
+      del self.info.options.with_xerces
+      del self.info.options.with_zlib
+
   def generate(self):
-    self.ace_root = os.path.join(self.source_folder, "ACE_wrappers")
-    self.tao_root = os.path.join(self.ace_root, "TAO")
     ad = AutotoolsDeps(self)
-    ad.environment.define("ACE_ROOT", self.ace_root)
-    ad.environment.define("TAO_ROOT", self.tao_root)
+    ad.environment.define("ACE_ROOT", self._ace_root)
+    ad.environment.define("TAO_ROOT", self._tao_root)
     ad.environment.define("INSTALL_PREFIX", "/")
+    if "lzo" in self.dependencies:
+      ad.environment.define("LZO2_ROOT", self.dependencies["lzo"].package_folder)
     ad.generate()
     tc = AutotoolsToolchain(self)
     if self.options.with_bzip2:
       tc.make_args.append("bzip2=1")
+    if self.options.with_lzo:
+      tc.make_args.append("lzo2=1")
     if self.options.with_xerces:
       tc.make_args.append("xerces=1")
     if self.options.with_zlib:
       tc.make_args.append("zlib=1")
+    if not self.options.shared:
+      tc.make_args.append("static_libs_only=1")
+    if not self.options.threads:
+      tc.make_args.append("threads=0")
+    if self.options.profile == "performance":
+      tc.make_args.append("inline=1")
     if self.settings.build_type == "Debug" or self.settings.build_type == "RelWithDebInfo":
       tc.make_args.append("debug=1")
     if self.settings.build_type == "Debug":
       tc.make_args.append("optimize=0")
     tc.generate()
 
+  def _seed_lower_layers(self):
+    # The projects of this layer find the libraries, tools and generated
+    # headers of the lower layers where the workspace would have built them.
+    for layer in self._lower_layers:
+      dependency = self.dependencies[layer]
+      copy(self, "lib*", dependency.cpp_info.libdir, os.path.join(self._ace_root, "lib"))
+      copy(self, "*", dependency.cpp_info.bindir, os.path.join(self._ace_root, "bin"))
+      # The ace headers install below ACE_ROOT, the tao ones below TAO_ROOT.
+      # Only the files missing from the sources are added, like the stubs
+      # that the IDL projects of the layer generated.
+      root = self._ace_root if layer == "ace" else self._tao_root
+      for folder, _, names in os.walk(dependency.cpp_info.includedir):
+        for name in names:
+          target = os.path.join(root, os.path.relpath(os.path.join(folder, name), dependency.cpp_info.includedir))
+          if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(os.path.join(folder, name), target)
+
   def build(self):
     features = ""
     if self.options.with_bzip2:
       features += "bzip2=1\n"
+    if self.options.with_lzo:
+      # The lzo package installs LZO 2 (liblzo2, include/lzo), the layout
+      # the lzo2 feature expects below LZO2_ROOT.
+      features += "lzo2=1\n"
     if self.options.with_xerces:
       features += "xerces=1\n"
     if self.options.with_zlib:
       features += "zlib=1\n"
-    save(self, os.path.join(self.ace_root, "MPC/config/default.features"), features)
-    with chdir(self, self.tao_root):
-      self.run("$ACE_ROOT/bin/mwc.pl TAO_ACE.mwc -type gnuace")
-      autotools = Autotools(self)
-      autotools.make()
+    if self.options.profile == "footprint":
+      # MPC does not generate the projects that need the removed features.
+      features += "minimum_corba=1\ncorba_e_compact=1\nami=0\ninterceptors=0\n"
+    save(self, os.path.join(self._ace_root, "MPC/config/default.features"), features)
+    if self.options.profiling:
+      self._generate_probes()
+    self._write_config()
+    self._write_build_timer()
+    pgo = self.options.optimization == "pgo"
+    self._write_platform_macros("generate" if pgo else None)
+    self._generate_makefiles(features)
+    self._seed_lower_layers()
+    env = Environment()
+    if self.options.compiler_cache:
+      self._compiler_cache_env(env)
+    with env.vars(self).apply():
+      if pgo:
+        self._make()
+        self._train_pgo_profile()
+        self._make("clean")
+        self._write_platform_macros("use")
+      # Only the final build goes into the build report and the statistics.
+      save(self, self._build_log, "")
+      if self.options.compiler_cache:
+        self._reset_compiler_cache_stats()
+      self._make()
+      if self.options.compiler_cache:
+        hits, misses = self._compiler_cache_stats()
+        rate = 100.0 * hits / (hits + misses) if hits + misses else 0.0
+        self.output.info(f"{self.options.compiler_cache}: {hits} hits, {misses} misses ({rate:.1f}% hit rate)")
 
   def package(self):
-    with chdir(self, self.tao_root):
-      autotools = Autotools(self)
-      autotools.install()
+    if self.options.shared:
+      for preset, component in self._svc_conf_presets.items():
+        if component in self._selected_components and (self.options.threads or preset == "single_threaded"):
+          copy(self, f"{preset}.conf", os.path.join(self.source_folder, "svc_conf"),
+               os.path.join(self.package_folder, "res", "svc_conf"))
+    if self._layer in (None, self._mpc_tools["tao_idl"]):
+      copy(self, "TaoIdl*.cmake", os.path.join(self.source_folder, "cmake"),
+           os.path.join(self.package_folder, "lib", "cmake", "ace_tao"))
+    autotools = Autotools(self)
+    if not self._partial_build:
+      with chdir(self, self._tao_root):
+        autotools.install()
+    else:
+      for directory, project in self._selected_projects():
+        with chdir(self, directory):
+          autotools.install(makefile=f"GNUmakefile.{project}")
+    if self.options.profiling and os.path.isfile(self._dtrace_header) and "ACE" in self._selected_components:
+      copy(self, "ace_dtrace.h", os.path.join(self._ace_root, "ace"), os.path.join(self.package_folder, "include", "ace"))
+    if self.options.profiling:
+      self._split_debug_info()
+    self._write_build_report()
+
+  def _library_sections(self, path):
+    output = StringIO()
+    self.run(f"size {path}", stdout=output)
+    # Archives list a line per object file.
+    sections = {"text": 0, "data": 0, "bss": 0}
+    for line in output.getvalue().splitlines():
+      fields = line.split()
+      if len(fields) >= 3 and all(field.isdigit() for field in fields[:3]):
+        for section, field in zip(sections, fields):
+          sections[section] += int(field)
+    return sections
+
+  def _write_build_report(self):
+    projects = {}
+    if os.path.isfile(self._build_log):
+      with open(self._build_log) as f:
+        for line in f:
+          project, start, end = line.split()
+          projects.setdefault(project, []).append((float(start), float(end)))
+    report = {
+        "name": str(self.name),
+        "version": str(self.version),
+        "settings": {key: str(value) for key, value in self.settings.items()},
+        "options": {key: str(value) for key, value in self.options.items()},
+        "projects": {
+            project: {
+                "wall_seconds": round(max(end for _, end in steps) - min(start for start, _ in steps), 3),
+                "command_seconds": round(sum(end - start for start, end in steps), 3),
+                "commands": len(steps)
+                }
+            for project, steps in sorted(projects.items())
+            },
+        "libraries": {}
+        }
+    libdir = os.path.join(self.package_folder, "lib")
+    for library in sorted(os.listdir(libdir)) if os.path.isdir(libdir) else []:
+      path = os.path.join(libdir, library)
+      if library.startswith("lib") and not os.path.islink(path) and re.search(r"\.(a|so)(\.|$)", library):
+        report["libraries"][library] = {"size": os.path.getsize(path), **self._library_sections(path)}
+    # The timings differ between builds of the same package ID, so the
+    # report stays in the build folder instead of the package.
+    report_file = os.path.join(self.build_folder, "build_report.json")
+    save(self, report_file, json.dumps(report, indent=2) + "\n")
+    self.output.info(f"Build report written to {report_file}")
 
   def package_info(self):
-    self.cpp_info.set_property("cmake_target_name", "ace+tao")
+    self.cpp_info.set_property("cmake_target_name", str(self.name))
     self.cpp_info.set_property("cmake_find_mode", "both")
-    self.cpp_info.components["ACE_ETCL_Parser"].set_property("cmake_target_name", "ace+tao::ACE_ETCL_Parser")
-    self.cpp_info.components["ACE_ETCL_Parser"].libs = ["ACE_ETCL_Parser"]
-    self.cpp_info.components["ACE_ETCL_Parser"].requires = ["ACE_ETCL"]
-    self.cpp_info.components["ACE_ETCL"].set_property("cmake_target_name", "ace+tao::ACE_ETCL")
-    self.cpp_info.components["ACE_ETCL"].libs = ["ACE_ETCL"]
-    self.cpp_info.components["ACE_ETCL"].requires = ["ACE"]
-    self.cpp_info.components["ACE_HTBP"].set_property("cmake_target_name", "ace+tao::ACE_HTBP")
-    self.cpp_info.components["ACE_HTBP"].libs = ["ACE_HTBP"]
-    self.cpp_info.components["ACE_HTBP"].requires = ["ACE"]
-    self.cpp_info.components["ACE_INet"].set_property("cmake_target_name", "ace+tao::ACE_INet")
-    self.cpp_info.components["ACE_INet"].libs = ["ACE_INet"]
-    self.cpp_info.components["ACE_INet"].requires = ["ACE"]
-    self.cpp_info.components["ACE_Monitor_Control"].set_property("cmake_target_name", "ace+tao::ACE_Monitor_Control")
-    self.cpp_info.components["ACE_Monitor_Control"].libs = ["ACE_Monitor_Control"]
-    self.cpp_info.components["ACE_Monitor_Control"].requires = ["ACE_ETCL_Parser"]
-    self.cpp_info.components["ACE"].set_property("cmake_target_name", "ace+tao::ACE")
-    self.cpp_info.components["ACE"].libs = ["ACE"]
+    components = self._components
+    # The features that footprint or threads=False remove take their
+    # libraries with them, and gnuace skips the projects whose requirements
+    # are not met.
+    selected = [name for name in self._selected_components if self._packaged(name)]
+    for name in selected:
+      component = self.cpp_info.components[name]
+      component.set_property("cmake_target_name", f"{self.name}::{name}")
+      component.libs = [name]
+      requires = [r for r in components[name] if "::" in r or r in selected or self._packaged(r)]
+      # Components of the lower layers come from their packages.
+      component.requires = [r if "::" in r or r in selected else f"{self._component_layer(r)}::{r}"
+                            for r in requires]
+    if "ACE" in selected:
+      self._ace_package_info()
+    if self.options.svc_conf and self._svc_conf_presets[str(self.options.svc_conf)] in selected:
+      self.runenv_info.define_path("ACE_TAO_SVC_CONF",
+                                   os.path.join(self.package_folder, "res", "svc_conf", f"{self.options.svc_conf}.conf"))
+    # ace_gperf and tao_idl run in the build context of the consumers, which
+    # may use the package as a tool requirement.
+    bindir = os.path.join(self.package_folder, "bin")
+    self.buildenv_info.prepend_path("PATH", bindir)
+    if self.options.shared:
+      self.buildenv_info.prepend_path("LD_LIBRARY_PATH", os.path.join(self.package_folder, "lib"))
+    if self._layer in (None, self._mpc_tools["tao_idl"]):
+      # tao_idl finds orb.idl and the other IDL files of TAO below TAO_ROOT.
+      self.buildenv_info.define_path("TAO_ROOT", os.path.join(self.package_folder, "include"))
+      self.conf_info.define_path("user.ace_tao:tao_idl", os.path.join(bindir, "tao_idl"))
+      self.cpp_info.set_property("cmake_build_modules", [os.path.join("lib", "cmake", "ace_tao", "TaoIdl.cmake")])
+
+  def _packaged(self, name):
+    layer = self._component_layer(name)
+    package_folder = self.package_folder if self._layer in (None, layer) else self.dependencies[layer].package_folder
+    return any(os.path.isfile(os.path.join(package_folder, "lib", f"lib{name}{suffix}")) for suffix in (".so", ".a"))
+
+  def _ace_package_info(self):
     self.cpp_info.components["ACE"].system_libs = ["dl", "rt"]
     if self.options.with_bzip2:
       self.cpp_info.components["ACE"].system_libs.append("bz2")
-      self.cpp_info.components["ACE"].requires.append("bzip2::bzip2")
     if self.options.with_xerces:
       self.cpp_info.components["ACE"].system_libs.append("pthread")
-      self.cpp_info.components["ACE"].requires.append("xerces-c::xerces-c")
     if self.options.with_zlib:
       self.cpp_info.components["ACE"].system_libs.append("z")
-      self.cpp_info.components["ACE"].requires.append("zlib::zlib")
-    self.cpp_info.components["ACE_RMCast"].set_property("cmake_target_name", "ace+tao::ACE_RMCast")
-    self.cpp_info.components["ACE_RMCast"].libs = ["ACE_RMCast"]
-    self.cpp_info.components["ACE_RMCast"].requires = ["ACE"]
-    self.cpp_info.components["ACE_TMCast"].set_property("cmake_target_name", "ace+tao::ACE_TMCast")
-    self.cpp_info.components["ACE_TMCast"].libs = ["ACE_TMCast"]
-    self.cpp_info.components["ACE_TMCast"].requires = ["ACE"]
-    self.cpp_info.components["ACEXML_Parser"].set_property("cmake_target_name", "ace+tao::ACEXML_Parser")
-    self.cpp_info.components["ACEXML_Parser"].libs = ["ACEXML_Parser"]
-    self.cpp_info.components["ACEXML_Parser"].requires = ["ACEXML"]
-    self.cpp_info.components["ACEXML"].set_property("cmake_target_name", "ace+tao::ACEXML")
-    self.cpp_info.components["ACEXML"].libs = ["ACEXML"]
-    self.cpp_info.components["ACEXML"].requires = ["ACE"]
-    if self.options.with_xerces:
-      self.cpp_info.components["ACE_XML_Utils"].set_property("cmake_target_name", "ace+tao::ACE_XML_Utils")
-      self.cpp_info.components["ACE_XML_Utils"].libs = ["ACE_XML_Utils"]
-      self.cpp_info.components["ACE_XML_Utils"].requires = ["ACE", "xerces-c::xerces-c"]
-    self.cpp_info.components["ACEXML_XML_Svc_Conf_Parser"].set_property("cmake_target_name", "ace+tao::ACEXML_XML_Svc_Conf_Parser")
-    self.cpp_info.components["ACEXML_XML_Svc_Conf_Parser"].libs = ["ACEXML_XML_Svc_Conf_Parser"]
-    self.cpp_info.components["ACEXML_XML_Svc_Conf_Parser"].requires = ["ACEXML_Parser"]
-    self.cpp_info.components["Kokyu"].set_property("cmake_target_name", "ace+tao::Kokyu")
-    self.cpp_info.components["Kokyu"].libs = ["Kokyu"]
-    self.cpp_info.components["Kokyu"].requires = ["ACE"]
-    self.cpp_info.components["TAO_AnyTypeCode"].set_property("cmake_target_name", "ace+tao::TAO_AnyTypeCode")
-    self.cpp_info.components["TAO_AnyTypeCode"].libs = ["TAO_AnyTypeCode"]
-    self.cpp_info.components["TAO_AnyTypeCode"].requires = ["TAO"]
-    self.cpp_info.components["TAO_Async_IORTable"].set_property("cmake_target_name", "ace+tao::TAO_Async_IORTable")
-    self.cpp_info.components["TAO_Async_IORTable"].libs = ["TAO_Async_IORTable"]
-    self.cpp_info.components["TAO_Async_IORTable"].requires = ["TAO", "TAO_IORTable"]
-    self.cpp_info.components["TAO_BiDirGIOP"].set_property("cmake_target_name", "ace+tao::TAO_BiDirGIOP")
-    self.cpp_info.components["TAO_BiDirGIOP"].libs = ["TAO_BiDirGIOP"]
-    self.cpp_info.components["TAO_BiDirGIOP"].requires = ["TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    if self.options.with_bzip2:
-      self.cpp_info.components["TAO_Bzip2Compressor"].set_property("cmake_target_name", "ace+tao::TAO_Bzip2Compressor")
-      self.cpp_info.components["TAO_Bzip2Compressor"].libs = ["TAO_Bzip2Compressor"]
-      self.cpp_info.components["TAO_Bzip2Compressor"].requires = ["TAO_Compression", "bzip2::bzip2"]
-    self.cpp_info.components["TAO_CodecFactory"].set_property("cmake_target_name", "ace+tao::TAO_CodecFactory")
-    self.cpp_info.components["TAO_CodecFactory"].libs = ["TAO_CodecFactory"]
-    self.cpp_info.components["TAO_CodecFactory"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_Codeset"].set_property("cmake_target_name", "ace+tao::TAO_Codeset")
-    self.cpp_info.components["TAO_Codeset"].libs = ["TAO_Codeset"]
-    self.cpp_info.components["TAO_Codeset"].requires = ["TAO"]
-    self.cpp_info.components["TAO_Compression"].set_property("cmake_target_name", "ace+tao::TAO_Compression")
-    self.cpp_info.components["TAO_Compression"].libs = ["TAO_Compression"]
-    self.cpp_info.components["TAO_Compression"].requires = ["TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosConcurrency"].set_property("cmake_target_name", "ace+tao::TAO_CosConcurrency")
-    self.cpp_info.components["TAO_CosConcurrency"].libs = ["TAO_CosConcurrency"]
-    self.cpp_info.components["TAO_CosConcurrency"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosConcurrency_Serv"].set_property("cmake_target_name", "ace+tao::TAO_CosConcurrency_Serv")
-    self.cpp_info.components["TAO_CosConcurrency_Serv"].libs = ["TAO_CosConcurrency_Serv"]
-    self.cpp_info.components["TAO_CosConcurrency_Serv"].requires = ["TAO_CosConcurrency_Skel"]
-    self.cpp_info.components["TAO_CosConcurrency_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosConcurrency_Skel")
-    self.cpp_info.components["TAO_CosConcurrency_Skel"].libs = ["TAO_CosConcurrency_Skel"]
-    self.cpp_info.components["TAO_CosConcurrency_Skel"].requires = ["TAO_CosConcurrency", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CosEvent"].set_property("cmake_target_name", "ace+tao::TAO_CosEvent")
-    self.cpp_info.components["TAO_CosEvent"].libs = ["TAO_CosEvent"]
-    self.cpp_info.components["TAO_CosEvent"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosEvent_Serv"].set_property("cmake_target_name", "ace+tao::TAO_CosEvent_Serv")
-    self.cpp_info.components["TAO_CosEvent_Serv"].libs = ["TAO_CosEvent_Serv"]
-    self.cpp_info.components["TAO_CosEvent_Serv"].requires = ["TAO_CosEvent_Skel", "TAO_DynamicInterface", "TAO_IFR_Client", "TAO_Messaging", "TAO_CosNaming", "TAO_Svc_Utils"]
-    self.cpp_info.components["TAO_CosEvent_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosEvent_Skel")
-    self.cpp_info.components["TAO_CosEvent_Skel"].libs = ["TAO_CosEvent_Skel"]
-    self.cpp_info.components["TAO_CosEvent_Skel"].requires = ["TAO_CosEvent", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CosLifeCycle"].set_property("cmake_target_name", "ace+tao::TAO_CosLifeCycle")
-    self.cpp_info.components["TAO_CosLifeCycle"].libs = ["TAO_CosLifeCycle"]
-    self.cpp_info.components["TAO_CosLifeCycle"].requires = ["TAO_CosNaming", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosLifeCycle_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosLifeCycle_Skel")
-    self.cpp_info.components["TAO_CosLifeCycle_Skel"].libs = ["TAO_CosLifeCycle_Skel"]
-    self.cpp_info.components["TAO_CosLifeCycle_Skel"].requires = ["TAO_CosLifeCycle", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CosLoadBalancing"].set_property("cmake_target_name", "ace+tao::TAO_CosLoadBalancing")
-    self.cpp_info.components["TAO_CosLoadBalancing"].libs = ["TAO_CosLoadBalancing"]
-    self.cpp_info.components["TAO_CosLoadBalancing"].requires = ["TAO_CosNaming", "TAO_IORManip", "TAO_PortableGroup", "TAO"]
-    self.cpp_info.components["TAO_CosNaming"].set_property("cmake_target_name", "ace+tao::TAO_CosNaming")
-    self.cpp_info.components["TAO_CosNaming"].libs = ["TAO_CosNaming"]
-    self.cpp_info.components["TAO_CosNaming"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosNaming_Serv"].set_property("cmake_target_name", "ace+tao::TAO_CosNaming_Serv")
-    self.cpp_info.components["TAO_CosNaming_Serv"].libs = ["TAO_CosNaming_Serv"]
-    self.cpp_info.components["TAO_CosNaming_Serv"].requires = ["TAO_CosNaming_Skel", "TAO_Messaging", "TAO_Svc_Utils", "TAO_IORTable"]
-    self.cpp_info.components["TAO_CosNaming_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosNaming_Skel")
-    self.cpp_info.components["TAO_CosNaming_Skel"].libs = ["TAO_CosNaming_Skel"]
-    self.cpp_info.components["TAO_CosNaming_Skel"].requires = ["TAO_CosNaming", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CosNotification"].set_property("cmake_target_name", "ace+tao::TAO_CosNotification")
-    self.cpp_info.components["TAO_CosNotification"].libs = ["TAO_CosNotification"]
-    self.cpp_info.components["TAO_CosNotification"].requires = ["TAO_CosEvent", "TAO"]
-    self.cpp_info.components["TAO_CosNotification_Serv"].set_property("cmake_target_name", "ace+tao::TAO_CosNotification_Serv")
-    self.cpp_info.components["TAO_CosNotification_Serv"].libs = ["TAO_CosNotification_Serv"]
-    self.cpp_info.components["TAO_CosNotification_Serv"].requires = ["TAO_CosNotification_Skel", "TAO_Svc_Utils", "TAO_DynamicAny", "TAO_ETCL"]
-    self.cpp_info.components["TAO_CosNotification_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosNotification_Skel")
-    self.cpp_info.components["TAO_CosNotification_Skel"].libs = ["TAO_CosNotification_Skel"]
-    self.cpp_info.components["TAO_CosNotification_Skel"].requires = ["TAO_CosNotification", "TAO_CosEvent_Skel", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CosProperty"].set_property("cmake_target_name", "ace+tao::TAO_CosProperty")
-    self.cpp_info.components["TAO_CosProperty"].libs = ["TAO_CosProperty"]
-    self.cpp_info.components["TAO_CosProperty"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosProperty_Serv"].set_property("cmake_target_name", "ace+tao::TAO_CosProperty_Serv")
-    self.cpp_info.components["TAO_CosProperty_Serv"].libs = ["TAO_CosProperty_Serv"]
-    self.cpp_info.components["TAO_CosProperty_Serv"].requires = ["TAO_CosProperty_Skel"]
-    self.cpp_info.components["TAO_CosProperty_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosProperty_Skel")
-    self.cpp_info.components["TAO_CosProperty_Skel"].libs = ["TAO_CosProperty_Skel"]
-    self.cpp_info.components["TAO_CosProperty_Skel"].requires = ["TAO_CosProperty", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CosTime"].set_property("cmake_target_name", "ace+tao::TAO_CosTime")
-    self.cpp_info.components["TAO_CosTime"].libs = ["TAO_CosTime"]
-    self.cpp_info.components["TAO_CosTime"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosTime_Serv"].set_property("cmake_target_name", "ace+tao::TAO_CosTime_Serv")
-    self.cpp_info.components["TAO_CosTime_Serv"].libs = ["TAO_CosTime_Serv"]
-    self.cpp_info.components["TAO_CosTime_Serv"].requires = ["TAO_CosTime_Skel", "TAO_Svc_Utils"]
-    self.cpp_info.components["TAO_CosTime_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosTime_Skel")
-    self.cpp_info.components["TAO_CosTime_Skel"].libs = ["TAO_CosTime_Skel"]
-    self.cpp_info.components["TAO_CosTime_Skel"].requires = ["TAO_CosTime", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CosTrading"].set_property("cmake_target_name", "ace+tao::TAO_CosTrading")
-    self.cpp_info.components["TAO_CosTrading"].libs = ["TAO_CosTrading"]
-    self.cpp_info.components["TAO_CosTrading"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_CosTrading_Serv"].set_property("cmake_target_name", "ace+tao::TAO_CosTrading_Serv")
-    self.cpp_info.components["TAO_CosTrading_Serv"].libs = ["TAO_CosTrading_Serv"]
-    self.cpp_info.components["TAO_CosTrading_Serv"].requires = ["TAO_CosTrading_Skel", "TAO_Svc_Utils", "TAO_DynamicAny"]
-    self.cpp_info.components["TAO_CosTrading_Skel"].set_property("cmake_target_name", "ace+tao::TAO_CosTrading_Skel")
-    self.cpp_info.components["TAO_CosTrading_Skel"].libs = ["TAO_CosTrading_Skel"]
-    self.cpp_info.components["TAO_CosTrading_Skel"].requires = ["TAO_CosTrading", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_CSD_Framework"].set_property("cmake_target_name", "ace+tao::TAO_CSD_Framework")
-    self.cpp_info.components["TAO_CSD_Framework"].libs = ["TAO_CSD_Framework"]
-    self.cpp_info.components["TAO_CSD_Framework"].requires = ["TAO_PortableServer", "TAO_PI", "TAO"]
-    self.cpp_info.components["TAO_CSD_ThreadPool"].set_property("cmake_target_name", "ace+tao::TAO_CSD_ThreadPool")
-    self.cpp_info.components["TAO_CSD_ThreadPool"].libs = ["TAO_CSD_ThreadPool"]
-    self.cpp_info.components["TAO_CSD_ThreadPool"].requires = ["TAO_CSD_Framework"]
-    self.cpp_info.components["TAO_DiffServPolicy"].set_property("cmake_target_name", "ace+tao::TAO_DiffServPolicy")
-    self.cpp_info.components["TAO_DiffServPolicy"].libs = ["TAO_DiffServPolicy"]
-    self.cpp_info.components["TAO_DiffServPolicy"].requires = ["TAO_PI", "TAO_PortableServer", "TAO"]
-    self.cpp_info.components["TAO_DsEventLogAdmin"].set_property("cmake_target_name", "ace+tao::TAO_DsEventLogAdmin")
-    self.cpp_info.components["TAO_DsEventLogAdmin"].libs = ["TAO_DsEventLogAdmin"]
-    self.cpp_info.components["TAO_DsEventLogAdmin"].requires = ["TAO", "TAO_DsLogAdmin", "TAO_CosEvent"]
-    self.cpp_info.components["TAO_DsEventLogAdmin_Serv"].set_property("cmake_target_name", "ace+tao::TAO_DsEventLogAdmin_Serv")
-    self.cpp_info.components["TAO_DsEventLogAdmin_Serv"].libs = ["TAO_DsEventLogAdmin_Serv"]
-    self.cpp_info.components["TAO_DsEventLogAdmin_Serv"].requires = ["TAO_DsEventLogAdmin_Skel", "TAO_DsLogAdmin_Serv", "TAO_CosEvent_Serv"]
-    self.cpp_info.components["TAO_DsEventLogAdmin_Skel"].set_property("cmake_target_name", "ace+tao::TAO_DsEventLogAdmin_Skel")
-    self.cpp_info.components["TAO_DsEventLogAdmin_Skel"].libs = ["TAO_DsEventLogAdmin_Skel"]
-    self.cpp_info.components["TAO_DsEventLogAdmin_Skel"].requires = ["TAO_DsEventLogAdmin", "TAO_DsLogAdmin_Skel", "TAO_CosEvent_Skel", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_DsLogAdmin"].set_property("cmake_target_name", "ace+tao::TAO_DsLogAdmin")
-    self.cpp_info.components["TAO_DsLogAdmin"].libs = ["TAO_DsLogAdmin"]
-    self.cpp_info.components["TAO_DsLogAdmin"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_DsLogAdmin_Serv"].set_property("cmake_target_name", "ace+tao::TAO_DsLogAdmin_Serv")
-    self.cpp_info.components["TAO_DsLogAdmin_Serv"].libs = ["TAO_DsLogAdmin_Serv"]
-    self.cpp_info.components["TAO_DsLogAdmin_Serv"].requires = ["TAO_DsLogAdmin_Skel", "TAO_DynamicAny", "TAO_ETCL", "TAO_Svc_Utils"]
-    self.cpp_info.components["TAO_DsLogAdmin_Skel"].set_property("cmake_target_name", "ace+tao::TAO_DsLogAdmin_Skel")
-    self.cpp_info.components["TAO_DsLogAdmin_Skel"].libs = ["TAO_DsLogAdmin_Skel"]
-    self.cpp_info.components["TAO_DsLogAdmin_Skel"].requires = ["TAO_DsLogAdmin", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_DsNotifyLogAdmin"].set_property("cmake_target_name", "ace+tao::TAO_DsNotifyLogAdmin")
-    self.cpp_info.components["TAO_DsNotifyLogAdmin"].libs = ["TAO_DsNotifyLogAdmin"]
-    self.cpp_info.components["TAO_DsNotifyLogAdmin"].requires = ["TAO_DsEventLogAdmin", "TAO_DsLogAdmin", "TAO_CosNotification", "TAO_CosEvent", "TAO"]
-    self.cpp_info.components["TAO_DsNotifyLogAdmin_Serv"].set_property("cmake_target_name", "ace+tao::TAO_DsNotifyLogAdmin_Serv")
-    self.cpp_info.components["TAO_DsNotifyLogAdmin_Serv"].libs = ["TAO_DsNotifyLogAdmin_Serv"]
-    self.cpp_info.components["TAO_DsNotifyLogAdmin_Serv"].requires = ["TAO_DsNotifyLogAdmin_Skel", "TAO_DsLogAdmin_Serv"]
-    self.cpp_info.components["TAO_DsNotifyLogAdmin_Skel"].set_property("cmake_target_name", "ace+tao::TAO_DsNotifyLogAdmin_Skel")
-    self.cpp_info.components["TAO_DsNotifyLogAdmin_Skel"].libs = ["TAO_DsNotifyLogAdmin_Skel"]
-    self.cpp_info.components["TAO_DsNotifyLogAdmin_Skel"].requires = ["TAO_DsNotifyLogAdmin", "TAO_DsEventLogAdmin_Skel", "TAO_DsLogAdmin_Skel", "TAO_CosNotification_Skel", "TAO_CosEvent_Skel", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_DynamicAny"].set_property("cmake_target_name", "ace+tao::TAO_DynamicAny")
-    self.cpp_info.components["TAO_DynamicAny"].libs = ["TAO_DynamicAny"]
-    self.cpp_info.components["TAO_DynamicAny"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_DynamicInterface"].set_property("cmake_target_name", "ace+tao::TAO_DynamicInterface")
-    self.cpp_info.components["TAO_DynamicInterface"].libs = ["TAO_DynamicInterface"]
-    self.cpp_info.components["TAO_DynamicInterface"].requires = ["TAO_Messaging", "TAO_PI", "TAO_CodecFactory", "TAO_PortableServer", "TAO_Valuetype", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_EndpointPolicy"].set_property("cmake_target_name", "ace+tao::TAO_EndpointPolicy")
-    self.cpp_info.components["TAO_EndpointPolicy"].libs = ["TAO_EndpointPolicy"]
-    self.cpp_info.components["TAO_EndpointPolicy"].requires = ["TAO_PI", "TAO_PortableServer", "TAO"]
-    self.cpp_info.components["TAO_ETCL"].set_property("cmake_target_name", "ace+tao::TAO_ETCL")
-    self.cpp_info.components["TAO_ETCL"].libs = ["TAO_ETCL"]
-    self.cpp_info.components["TAO_ETCL"].requires = ["ACE_ETCL"]
-    self.cpp_info.components["TAO_FaultTolerance"].set_property("cmake_target_name", "ace+tao::TAO_FaultTolerance")
-    self.cpp_info.components["TAO_FaultTolerance"].libs = ["TAO_FaultTolerance"]
-    self.cpp_info.components["TAO_FaultTolerance"].requires = ["TAO_FT_ServerORB", "TAO_FT_ClientORB", "TAO_CosNotification"]
-    self.cpp_info.components["TAO_FT_ClientORB"].set_property("cmake_target_name", "ace+tao::TAO_FT_ClientORB")
-    self.cpp_info.components["TAO_FT_ClientORB"].libs = ["TAO_FT_ClientORB"]
-    self.cpp_info.components["TAO_FT_ClientORB"].requires = ["TAO_FTORB_Utils", "TAO_Messaging", "TAO_PortableGroup"]
-    self.cpp_info.components["TAO_FTORB_Utils"].set_property("cmake_target_name", "ace+tao::TAO_FTORB_Utils")
-    self.cpp_info.components["TAO_FTORB_Utils"].libs = ["TAO_FTORB_Utils"]
-    self.cpp_info.components["TAO_FTORB_Utils"].requires = ["TAO_IORManip", "TAO_PortableServer", "TAO"]
-    self.cpp_info.components["TAO_FT_ServerORB"].set_property("cmake_target_name", "ace+tao::TAO_FT_ServerORB")
-    self.cpp_info.components["TAO_FT_ServerORB"].libs = ["TAO_FT_ServerORB"]
-    self.cpp_info.components["TAO_FT_ServerORB"].requires = ["TAO_FTORB_Utils", "TAO_Messaging", "TAO_PortableGroup"]
-    self.cpp_info.components["TAO_IFR_Client"].set_property("cmake_target_name", "ace+tao::TAO_IFR_Client")
-    self.cpp_info.components["TAO_IFR_Client"].libs = ["TAO_IFR_Client"]
-    self.cpp_info.components["TAO_IFR_Client"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_ImR_Client"].set_property("cmake_target_name", "ace+tao::TAO_ImR_Client")
-    self.cpp_info.components["TAO_ImR_Client"].libs = ["TAO_ImR_Client"]
-    self.cpp_info.components["TAO_ImR_Client"].requires = ["TAO_PortableServer", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_IORInterceptor"].set_property("cmake_target_name", "ace+tao::TAO_IORInterceptor")
-    self.cpp_info.components["TAO_IORInterceptor"].libs = ["TAO_IORInterceptor"]
-    self.cpp_info.components["TAO_IORInterceptor"].requires = ["TAO_PI", "TAO_CodecFactory", "TAO_ObjRefTemplate", "TAO_Valuetype", "TAO_PortableServer", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_IORManip"].set_property("cmake_target_name", "ace+tao::TAO_IORManip")
-    self.cpp_info.components["TAO_IORManip"].libs = ["TAO_IORManip"]
-    self.cpp_info.components["TAO_IORManip"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_IORTable"].set_property("cmake_target_name", "ace+tao::TAO_IORTable")
-    self.cpp_info.components["TAO_IORTable"].libs = ["TAO_IORTable"]
-    self.cpp_info.components["TAO_IORTable"].requires = ["TAO"]
-    self.cpp_info.components["TAO_Messaging"].set_property("cmake_target_name", "ace+tao::TAO_Messaging")
-    self.cpp_info.components["TAO_Messaging"].libs = ["TAO_Messaging"]
-    self.cpp_info.components["TAO_Messaging"].requires = ["TAO_Valuetype", "TAO_PI", "TAO_CodecFactory", "TAO_PortableServer", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_Monitor"].set_property("cmake_target_name", "ace+tao::TAO_Monitor")
-    self.cpp_info.components["TAO_Monitor"].libs = ["TAO_Monitor"]
-    self.cpp_info.components["TAO_Monitor"].requires = ["TAO_PortableServer", "ACE_Monitor_Control"]
-    self.cpp_info.components["TAO_ObjRefTemplate"].set_property("cmake_target_name", "ace+tao::TAO_ObjRefTemplate")
-    self.cpp_info.components["TAO_ObjRefTemplate"].libs = ["TAO_ObjRefTemplate"]
-    self.cpp_info.components["TAO_ObjRefTemplate"].requires = ["TAO_PortableServer", "TAO_Valuetype", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO"].set_property("cmake_target_name", "ace+tao::TAO")
-    self.cpp_info.components["TAO"].libs = ["TAO"]
-    self.cpp_info.components["TAO"].requires = ["ACE"]
-    self.cpp_info.components["TAO_PI"].set_property("cmake_target_name", "ace+tao::TAO_PI")
-    self.cpp_info.components["TAO_PI"].libs = ["TAO_PI"]
-    self.cpp_info.components["TAO_PI"].requires = ["TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_PI_Server"].set_property("cmake_target_name", "ace+tao::TAO_PI_Server")
-    self.cpp_info.components["TAO_PI_Server"].libs = ["TAO_PI_Server"]
-    self.cpp_info.components["TAO_PI_Server"].requires = ["TAO_PortableServer", "TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_PortableGroup"].set_property("cmake_target_name", "ace+tao::TAO_PortableGroup")
-    self.cpp_info.components["TAO_PortableGroup"].libs = ["TAO_PortableGroup"]
-    self.cpp_info.components["TAO_PortableGroup"].requires = ["TAO_CosNaming", "TAO_IORManip", "TAO_Messaging", "TAO"]
-    self.cpp_info.components["TAO_PortableServer"].set_property("cmake_target_name", "ace+tao::TAO_PortableServer")
-    self.cpp_info.components["TAO_PortableServer"].libs = ["TAO_PortableServer"]
-    self.cpp_info.components["TAO_PortableServer"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_RTCORBA"].set_property("cmake_target_name", "ace+tao::TAO_RTCORBA")
-    self.cpp_info.components["TAO_RTCORBA"].libs = ["TAO_RTCORBA"]
-    self.cpp_info.components["TAO_RTCORBA"].requires = ["TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_RTEventLogAdmin"].set_property("cmake_target_name", "ace+tao::TAO_RTEventLogAdmin")
-    self.cpp_info.components["TAO_RTEventLogAdmin"].libs = ["TAO_RTEventLogAdmin"]
-    self.cpp_info.components["TAO_RTEventLogAdmin"].requires = ["TAO", "TAO_DsLogAdmin", "TAO_RTEvent"]
-    self.cpp_info.components["TAO_RTEventLogAdmin_Serv"].set_property("cmake_target_name", "ace+tao::TAO_RTEventLogAdmin_Serv")
-    self.cpp_info.components["TAO_RTEventLogAdmin_Serv"].libs = ["TAO_RTEventLogAdmin_Serv"]
-    self.cpp_info.components["TAO_RTEventLogAdmin_Serv"].requires = ["TAO_RTEventLogAdmin_Skel", "TAO_DsLogAdmin_Serv", "TAO_RTEvent_Serv"]
-    self.cpp_info.components["TAO_RTEventLogAdmin_Skel"].set_property("cmake_target_name", "ace+tao::TAO_RTEventLogAdmin_Skel")
-    self.cpp_info.components["TAO_RTEventLogAdmin_Skel"].libs = ["TAO_RTEventLogAdmin_Skel"]
-    self.cpp_info.components["TAO_RTEventLogAdmin_Skel"].requires = ["TAO_RTEventLogAdmin", "TAO_DsLogAdmin_Skel", "TAO_RTEvent_Skel", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_RTEvent"].set_property("cmake_target_name", "ace+tao::TAO_RTEvent")
-    self.cpp_info.components["TAO_RTEvent"].libs = ["TAO_RTEvent"]
-    self.cpp_info.components["TAO_RTEvent"].requires = ["TAO_Svc_Utils", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_RTEvent_Serv"].set_property("cmake_target_name", "ace+tao::TAO_RTEvent_Serv")
-    self.cpp_info.components["TAO_RTEvent_Serv"].libs = ["TAO_RTEvent_Serv"]
-    self.cpp_info.components["TAO_RTEvent_Serv"].requires = ["TAO_RTEvent_Skel", "TAO_Svc_Utils", "TAO_Messaging"]
-    self.cpp_info.components["TAO_RTEvent_Skel"].set_property("cmake_target_name", "ace+tao::TAO_RTEvent_Skel")
-    self.cpp_info.components["TAO_RTEvent_Skel"].libs = ["TAO_RTEvent_Skel"]
-    self.cpp_info.components["TAO_RTEvent_Skel"].requires = ["TAO_RTEvent", "TAO_PortableServer"]
-    self.cpp_info.components["TAO_RTPortableServer"].set_property("cmake_target_name", "ace+tao::TAO_RTPortableServer")
-    self.cpp_info.components["TAO_RTPortableServer"].libs = ["TAO_RTPortableServer"]
-    self.cpp_info.components["TAO_RTPortableServer"].requires = ["TAO_PortableServer", "TAO_RTCORBA", "TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_RTScheduler"].set_property("cmake_target_name", "ace+tao::TAO_RTScheduler")
-    self.cpp_info.components["TAO_RTScheduler"].libs = ["TAO_RTScheduler"]
-    self.cpp_info.components["TAO_RTScheduler"].requires = ["TAO_PI_Server", "TAO_PortableServer", "TAO_RTCORBA", "TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_SmartProxies"].set_property("cmake_target_name", "ace+tao::TAO_SmartProxies")
-    self.cpp_info.components["TAO_SmartProxies"].libs = ["TAO_SmartProxies"]
-    self.cpp_info.components["TAO_SmartProxies"].requires = ["TAO"]
-    self.cpp_info.components["TAO_Strategies"].set_property("cmake_target_name", "ace+tao::TAO_Strategies")
-    self.cpp_info.components["TAO_Strategies"].libs = ["TAO_Strategies"]
-    self.cpp_info.components["TAO_Strategies"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_Svc_Utils"].set_property("cmake_target_name", "ace+tao::TAO_Svc_Utils")
-    self.cpp_info.components["TAO_Svc_Utils"].libs = ["TAO_Svc_Utils"]
-    self.cpp_info.components["TAO_Svc_Utils"].requires = ["TAO_PortableServer"]
-    self.cpp_info.components["TAO_TypeCodeFactory"].set_property("cmake_target_name", "ace+tao::TAO_TypeCodeFactory")
-    self.cpp_info.components["TAO_TypeCodeFactory"].libs = ["TAO_TypeCodeFactory"]
-    self.cpp_info.components["TAO_TypeCodeFactory"].requires = ["TAO_IFR_Client", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_Utils"].set_property("cmake_target_name", "ace+tao::TAO_Utils")
-    self.cpp_info.components["TAO_Utils"].libs = ["TAO_Utils"]
-    self.cpp_info.components["TAO_Utils"].requires = ["TAO_PI", "TAO_CodecFactory", "TAO_PortableServer", "TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_Valuetype"].set_property("cmake_target_name", "ace+tao::TAO_Valuetype")
-    self.cpp_info.components["TAO_Valuetype"].libs = ["TAO_Valuetype"]
-    self.cpp_info.components["TAO_Valuetype"].requires = ["TAO_AnyTypeCode", "TAO"]
-    self.cpp_info.components["TAO_ZIOP"].set_property("cmake_target_name", "ace+tao::TAO_ZIOP")
-    self.cpp_info.components["TAO_ZIOP"].libs = ["TAO_ZIOP"]
-    self.cpp_info.components["TAO_ZIOP"].requires = ["TAO_PI", "TAO_CodecFactory", "TAO_AnyTypeCode", "TAO"]
-    if self.options.with_zlib:
-      self.cpp_info.components["TAO_ZlibCompressor"].set_property("cmake_target_name", "ace+tao::TAO_ZlibCompressor")
-      self.cpp_info.components["TAO_ZlibCompressor"].libs = ["TAO_ZlibCompressor"]
-      self.cpp_info.components["TAO_ZlibCompressor"].requires = ["TAO_Compression", "zlib::zlib"]
+    if not self.options.shared:
+      # The link order of the static libraries follows from the requires
+      # of the components, which Conan sorts topologically.
+      self.cpp_info.components["ACE"].defines = ["ACE_AS_STATIC_LIBS", "TAO_AS_STATIC_LIBS"]
+      if self.options.threads and "pthread" not in self.cpp_info.components["ACE"].system_libs:
+        self.cpp_info.components["ACE"].system_libs.append("pthread")
+    self.conf_info.define("user.ace_tao:profile", str(self.options.profile))
     self.output.info("Setting ACE_ROOT: {}".format(self.package_folder))
     self.runenv_info.define("ACE_ROOT", self.package_folder)
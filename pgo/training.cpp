@@ -0,0 +1,117 @@
+// Sends GIOP requests of varying size to a servant in the same process.
+// Run with -ORBCollocation no so that every request goes through the
+// IIOP transport, CDR marshalling, reactor dispatch and POA demux.
+
+#include "TrainingS.h"
+#include "ace/Get_Opt.h"
+#include "ace/Task.h"
+#include "ace/OS_NS_stdlib.h"
+
+class Echo_i : public virtual POA_Training::Echo
+{
+public:
+  explicit Echo_i (CORBA::ORB_ptr orb)
+    : orb_ (CORBA::ORB::_duplicate (orb))
+  {
+  }
+
+  Training::Octets * echo_octets (const Training::Octets & data) override
+  {
+    return new Training::Octets (data);
+  }
+
+  Training::Samples * echo_samples (const Training::Samples & data) override
+  {
+    return new Training::Samples (data);
+  }
+
+  void shutdown () override
+  {
+    this->orb_->shutdown (false);
+  }
+
+private:
+  CORBA::ORB_var orb_;
+};
+
+class ORB_Task : public ACE_Task_Base
+{
+public:
+  explicit ORB_Task (CORBA::ORB_ptr orb)
+    : orb_ (CORBA::ORB::_duplicate (orb))
+  {
+  }
+
+  int svc () override
+  {
+    this->orb_->run ();
+    return 0;
+  }
+
+private:
+  CORBA::ORB_var orb_;
+};
+
+int
+ACE_TMAIN (int argc, ACE_TCHAR *argv[])
+{
+  try
+    {
+      CORBA::ORB_var orb = CORBA::ORB_init (argc, argv);
+
+      int iterations = 20000;
+      ACE_Get_Opt get_opts (argc, argv, ACE_TEXT ("n:"));
+      for (int c; (c = get_opts ()) != -1; )
+        if (c == 'n')
+          iterations = ACE_OS::atoi (get_opts.opt_arg ());
+
+      CORBA::Object_var obj = orb->resolve_initial_references ("RootPOA");
+      PortableServer::POA_var root_poa = PortableServer::POA::_narrow (obj.in ());
+      PortableServer::POAManager_var poa_manager = root_poa->the_POAManager ();
+
+      PortableServer::Servant_var<Echo_i> servant = new Echo_i (orb.in ());
+      PortableServer::ObjectId_var id = root_poa->activate_object (servant.in ());
+      obj = root_poa->id_to_reference (id.in ());
+      Training::Echo_var echo = Training::Echo::_narrow (obj.in ());
+      poa_manager->activate ();
+
+      ORB_Task orb_task (orb.in ());
+      if (orb_task.activate (THR_NEW_LWP | THR_JOINABLE, 2) == -1)
+        ACE_ERROR_RETURN ((LM_ERROR, ACE_TEXT ("Cannot activate ORB threads\n")), 1);
+
+      static const CORBA::ULong sizes[] = { 0, 64, 1024, 16384, 65536 };
+      for (int i = 0; i < iterations; ++i)
+        {
+          const CORBA::ULong size = sizes[i % (sizeof (sizes) / sizeof (sizes[0]))];
+
+          Training::Octets octets (size);
+          octets.length (size);
+          for (CORBA::ULong j = 0; j < size; ++j)
+            octets[j] = static_cast<CORBA::Octet> (j);
+          Training::Octets_var octets_reply = echo->echo_octets (octets);
+
+          Training::Samples samples (size / 64);
+          samples.length (size / 64);
+          for (CORBA::ULong j = 0; j < samples.length (); ++j)
+            {
+              samples[j].id = static_cast<CORBA::Long> (j);
+              samples[j].value = j * 0.5;
+              samples[j].name = CORBA::string_dup ("sample");
+            }
+          Training::Samples_var samples_reply = echo->echo_samples (samples);
+        }
+
+      echo->shutdown ();
+      orb_task.wait ();
+
+      root_poa->destroy (true, true);
+      orb->destroy ();
+    }
+  catch (const CORBA::Exception &ex)
+    {
+      ex._tao_print_exception ("pgo_training:");
+      return 1;
+    }
+
+  return 0;
+}
@@ -0,0 +1,177 @@
+#include <tao/CDR.h>
+#include <tao/Compression/Compression.h>
+#if defined(HAS_ZLIB_COMPRESSOR)
+#include <tao/Compression/zlib/ZlibCompressor_Factory.h>
+#endif
+#if defined(HAS_BZIP2_COMPRESSOR)
+#include <tao/Compression/bzip2/Bzip2Compressor_Factory.h>
+#endif
+#if defined(HAS_LZO_COMPRESSOR)
+#include <tao/Compression/lzo/LzoCompressor_Factory.h>
+#endif
+#if defined(HAS_RLE_COMPRESSOR)
+#include <tao/Compression/rle/RLECompressor_Factory.h>
+#endif
+
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <random>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
+
+namespace {
+
+struct Result {
+    std::string compressor;
+    std::string payload;
+    CORBA::ULong bytes;
+    double ratio;
+    double compress_mb_per_second;
+    double decompress_mb_per_second;
+};
+
+// A GIOP body as an application sends it: records of sequence numbers,
+// timestamps, measurements and short identifiers, marshalled to CDR.
+Compression::Buffer cdr_payload(CORBA::ULong size) {
+    TAO_OutputCDR cdr;
+    for (CORBA::ULong i = 0; cdr.total_length() < size; ++i) {
+        cdr << i;
+        cdr << static_cast<CORBA::ULongLong>(1700000000000ull + i * 20);
+        cdr << static_cast<CORBA::Double>(20.0 + (i % 50) * 0.125);
+        cdr << static_cast<CORBA::Short>(i % 8);
+        std::string const name = "sensor-" + std::to_string(i % 64);
+        cdr << name.c_str();
+    }
+    Compression::Buffer buffer(size);
+    buffer.length(size);
+    CORBA::ULong offset = 0;
+    for (const ACE_Message_Block* block = cdr.begin(); block && offset < size; block = block->cont()) {
+        CORBA::ULong const length = std::min<CORBA::ULong>(block->length(), size - offset);
+        std::memcpy(buffer.get_buffer() + offset, block->rd_ptr(), length);
+        offset += length;
+    }
+    return buffer;
+}
+
+// Encrypted or already compressed data, the worst case for a compressor.
+Compression::Buffer random_payload(CORBA::ULong size) {
+    Compression::Buffer buffer(size);
+    buffer.length(size);
+    std::mt19937 generator(42);
+    for (CORBA::ULong i = 0; i < size; ++i) {
+        buffer[i] = static_cast<CORBA::Octet>(generator());
+    }
+    return buffer;
+}
+
+Result measure(const std::string& name, Compression::Compressor_ptr compressor, const std::string& payload_name,
+               const Compression::Buffer& payload, int iterations) {
+    Compression::Buffer compressed;
+    Compression::Buffer decompressed;
+
+    auto const start = std::chrono::steady_clock::now();
+    for (int i = 0; i < iterations; ++i) {
+        compressor->compress(payload, compressed);
+    }
+    std::chrono::duration<double> const compress_elapsed = std::chrono::steady_clock::now() - start;
+
+    auto const restart = std::chrono::steady_clock::now();
+    for (int i = 0; i < iterations; ++i) {
+        // The receiver knows the original length from the ZIOP header.
+        decompressed.length(payload.length());
+        compressor->decompress(compressed, decompressed);
+    }
+    std::chrono::duration<double> const decompress_elapsed = std::chrono::steady_clock::now() - restart;
+
+    if (decompressed.length() != payload.length() ||
+        std::memcmp(decompressed.get_buffer(), payload.get_buffer(), payload.length()) != 0) {
+        throw std::runtime_error(name + " did not restore the " + payload_name + " payload");
+    }
+    double const megabytes = static_cast<double>(payload.length()) * iterations / 1e6;
+    return {name, payload_name, payload.length(),
+            static_cast<double>(payload.length()) / compressed.length(),
+            megabytes / compress_elapsed.count(), megabytes / decompress_elapsed.count()};
+}
+
+void write_results(const std::string& path, const std::vector<Result>& results) {
+    std::ofstream out(path);
+    out << "{\n  \"results\": [\n";
+    for (std::size_t i = 0; i < results.size(); ++i) {
+        const Result& r = results[i];
+        out << "    {\"compressor\": \"" << r.compressor << "\", \"payload\": \"" << r.payload
+            << "\", \"bytes\": " << r.bytes << ", \"ratio\": " << r.ratio
+            << ", \"compress_mb_per_second\": " << r.compress_mb_per_second
+            << ", \"decompress_mb_per_second\": " << r.decompress_mb_per_second << "}"
+            << (i + 1 < results.size() ? "," : "") << "\n";
+    }
+    out << "  ]\n}\n";
+}
+
+}  // namespace
+
+// Measures the ZIOP compressors of the package on CDR encoded records and
+// on random data, at the given compression level.
+//
+// Usage: compression_benchmark [--iterations N] [--level N] [--output results.json]
+int main(int argc, char* argv[]) {
+    int iterations = 200;
+    int level = 1;
+    std::string output = "compression_benchmark.json";
+    for (int i = 1; i + 1 < argc; i += 2) {
+        if (std::strcmp(argv[i], "--iterations") == 0) {
+            iterations = std::atoi(argv[i + 1]);
+        } else if (std::strcmp(argv[i], "--level") == 0) {
+            level = std::atoi(argv[i + 1]);
+        } else if (std::strcmp(argv[i], "--output") == 0) {
+            output = argv[i + 1];
+        }
+    }
+
+    try {
+        std::vector<std::pair<std::string, Compression::CompressorFactory_var>> factories;
+#if defined(HAS_ZLIB_COMPRESSOR)
+        factories.emplace_back("zlib", new TAO::Zlib_CompressorFactory());
+#endif
+#if defined(HAS_BZIP2_COMPRESSOR)
+        factories.emplace_back("bzip2", new TAO::Bzip2_CompressorFactory());
+#endif
+#if defined(HAS_LZO_COMPRESSOR)
+        factories.emplace_back("lzo", new TAO::Lzo_CompressorFactory());
+#endif
+#if defined(HAS_RLE_COMPRESSOR)
+        factories.emplace_back("rle", new TAO::RLE_CompressorFactory());
+#endif
+
+        std::vector<std::pair<std::string, Compression::Buffer>> payloads;
+        for (CORBA::ULong size : {1024u, 65536u}) {
+            payloads.emplace_back("cdr_" + std::to_string(size), cdr_payload(size));
+            payloads.emplace_back("random_" + std::to_string(size), random_payload(size));
+        }
+
+        std::vector<Result> results;
+        for (auto& factory : factories) {
+            Compression::Compressor_var compressor = factory.second->get_compressor(level);
+            for (const auto& payload : payloads) {
+                results.push_back(measure(factory.first, compressor.in(), payload.first, payload.second, iterations));
+            }
+        }
+
+        for (const Result& r : results) {
+            std::cout << r.compressor << " " << r.payload << ": ratio " << r.ratio << ", compress "
+                      << r.compress_mb_per_second << " MB/s, decompress " << r.decompress_mb_per_second << " MB/s\n";
+        }
+        write_results(output, results);
+    } catch (const CORBA::Exception& ex) {
+        ex._tao_print_exception("compression_benchmark:");
+        return 1;
+    } catch (const std::exception& ex) {
+        std::cerr << "compression_benchmark: " << ex.what() << "\n";
+        return 1;
+    }
+}
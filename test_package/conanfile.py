@@ -1,12 +1,17 @@
 from conan import ConanFile
-from conan.tools.cmake import CMake, cmake_layout
+from conan.errors import ConanException
+from conan.tools.cmake import CMake, CMakeToolchain, cmake_layout
 from conan.tools.build import can_run
 
+import glob
+import json
 import os
 
 class Log4cppTestConan(ConanFile):
     settings = "os", "compiler", "build_type", "arch"
-    generators = "CMakeDeps", "CMakeToolchain"
+    generators = "CMakeDeps"
+    # The modes and payload sizes orb_benchmark measures.
+    _orb_benchmark_runs = {(mode, size) for mode in ("iiop", "collocated") for size in (0, 64, 1024, 16384, 65536)}
 
     def requirements(self):
         self.requires(self.tested_reference_str)
@@ -14,12 +19,113 @@ class Log4cppTestConan(ConanFile):
     def layout(self):
         cmake_layout(self)
 
+    def generate(self):
+        tc = CMakeToolchain(self)
+        # The complete ace+tao package or one of its layered packages.
+        tc.variables["ACE_TAO_PACKAGE"] = self.dependencies[self.tested_reference_str].ref.name
+        tc.generate()
+
     def build(self):
         cmake = CMake(self)
         cmake.configure()
         cmake.build()
 
     def test(self):
-        if not can_run(self):
+        if can_run(self):
             cmd = os.path.join(self.cpp.build.bindir, "package_test")
             self.run(cmd, env="conanrun")
+            self._run_benchmarks()
+
+    def _run_compression_benchmark(self, results_folder):
+        benchmark = os.path.join(self.cpp.build.bindir, "compression_benchmark")
+        if not os.path.isfile(benchmark):
+            return
+        results = os.path.join(results_folder, "compression_benchmark.json")
+        self.run(f"{benchmark} --output {results}", env="conanrun")
+
+    @staticmethod
+    def _orb_benchmark_rates(path):
+        with open(path) as f:
+            return {(r["mode"], r["payload_bytes"]): r["requests_per_second"] for r in json.load(f)["results"]}
+
+    def _run_reactor_benchmark(self, results_folder, threads):
+        # Both variants write to the results folder, and the second one run
+        # compares itself to the first.
+        variants = {True: "threads", False: "single_threaded"}
+        benchmark = os.path.join(self.cpp.build.bindir, "reactor_benchmark")
+        results = os.path.join(results_folder, f"reactor_benchmark_{variants[threads]}.json")
+        self.run(f"{benchmark} --output {results}", env="conanrun")
+        other = os.path.join(results_folder, f"reactor_benchmark_{variants[not threads]}.json")
+        if os.path.isfile(other):
+            rates = {}
+            for variant, path in ((threads, results), (not threads, other)):
+                with open(path) as f:
+                    rates[variant] = json.load(f)["dispatches_per_second"]
+            self.output.info(f"Reactor dispatch rate: {rates[False]:.0f}/s single-threaded, "
+                             f"{rates[True]:.0f}/s with threads ({rates[False] / rates[True]:.2f}x)")
+
+    def _run_startup_benchmark(self, results_folder):
+        benchmark = os.path.join(self.cpp.build.bindir, "startup_benchmark")
+        if not os.path.isfile(benchmark):
+            return
+        # The libraries of services TAO loads through the service configurator.
+        libdirs = [os.path.join(dependency.package_folder, "lib") for dependency in self.dependencies.host.values()]
+        libraries = [f"lib{name}.so" for name in ("TAO_Strategies", "TAO_Codeset", "TAO_PI")
+                     if any(os.path.isfile(os.path.join(libdir, f"lib{name}.so")) for libdir in libdirs)]
+        arguments = " ".join(f"--library {library}" for library in libraries)
+        results = os.path.join(results_folder, "startup_benchmark.json")
+        self.run(f"{benchmark} {arguments} --output {results}", env="conanrun")
+
+    def _run_benchmarks(self):
+        results_folder = self.conf.get("user.ace_tao:benchmark_results_folder", default=self.build_folder)
+        iterations = self.conf.get("user.ace_tao:benchmark_iterations", default=2000, check_type=int)
+        os.makedirs(results_folder, exist_ok=True)
+        threads = bool(self.dependencies[self.tested_reference_str].options.threads)
+        self._run_reactor_benchmark(results_folder, threads)
+        self._run_compression_benchmark(results_folder)
+        self._run_startup_benchmark(results_folder)
+        footprint = os.path.join(self.cpp.build.bindir, "orb_footprint")
+        if os.path.isfile(footprint):
+            # The startup cost and resident memory of a server ORB, to
+            # compare the profiles of the package.
+            self.run(f"{footprint} --output {os.path.join(results_folder, 'orb_footprint.json')}", env="conanrun")
+        benchmark = os.path.join(self.cpp.build.bindir, "orb_benchmark")
+        if not os.path.isfile(benchmark):
+            return
+
+        # A build without threads runs only the single_threaded preset below,
+        # with the main thread driving both ORBs.
+        if threads:
+            results = os.path.join(results_folder, "orb_benchmark.json")
+            self.run(f"{benchmark} --iterations {iterations} --output {results}", env="conanrun")
+            if self.conf.get("user.ace_tao:flame_graph", default=False, check_type=bool):
+                script = os.path.join(self.source_folder, "flamegraph.sh")
+                flame_graph = os.path.join(results_folder, "orb_benchmark.svg")
+                self.run(f"{script} {benchmark} {flame_graph} --iterations {iterations} "
+                         f"--output {os.path.join(results_folder, 'orb_benchmark_profiled.json')}", env="conanrun")
+
+        # Every shipped svc.conf preset has to keep the ORB serving requests
+        # in every mode, at no less than the given share of the throughput
+        # of the default configuration.
+        baseline = self._orb_benchmark_rates(results) if threads else {}
+        tolerance = self.conf.get("user.ace_tao:benchmark_tolerance", default=0.5, check_type=float)
+        presets = [os.path.join(dependency.package_folder, "res", "svc_conf", "*.conf")
+                   for dependency in self.dependencies.host.values()]
+        for svc_conf in sorted(f for pattern in presets for f in glob.glob(pattern)):
+            preset = os.path.splitext(os.path.basename(svc_conf))[0]
+            results = os.path.join(results_folder, f"orb_benchmark_{preset}.json")
+            # Without threads ACE locks nothing, so no ORB may run in a thread
+            # of its own.
+            server_threads = (1 if threads else 0) if preset == "single_threaded" else 4
+            self.run(f"{benchmark} -ORBSvcConf {svc_conf} --server-threads {server_threads} "
+                     f"--iterations {iterations} --output {results}", env="conanrun")
+            rates = self._orb_benchmark_rates(results)
+            missing = sorted(self._orb_benchmark_runs - rates.keys())
+            if missing:
+                raise ConanException(f"svc.conf preset {preset} measured no requests for "
+                                     + ", ".join(f"{mode} {size} bytes" for mode, size in missing))
+            slow = sorted(run for run, rate in rates.items() if run in baseline and rate < tolerance * baseline[run])
+            if slow:
+                raise ConanException(f"svc.conf preset {preset} served less than {tolerance:.0%} of the default "
+                                     "throughput for " + ", ".join(f"{mode} {size} bytes" for mode, size in slow))
+            self.output.info(f"svc.conf preset {preset}: at least {min(rates.values()):.0f} requests/s")
@@ -0,0 +1,22 @@
+#!/bin/sh
+# Records a flame graph of orb_benchmark with perf.
+#
+#   flamegraph.sh <orb_benchmark> <flame graph .svg> [benchmark arguments...]
+#
+# Walks the stacks by frame pointers, as built with the profiling option.
+# Needs perf, and stackcollapse-perf.pl and flamegraph.pl of FlameGraph
+# (https://github.com/brendangregg/FlameGraph) in FLAMEGRAPH_DIR or on PATH.
+set -e
+
+benchmark=$1
+output=$2
+shift 2
+
+if [ -n "$FLAMEGRAPH_DIR" ]; then
+    PATH="$FLAMEGRAPH_DIR:$PATH"
+fi
+data="${output%.svg}.perf.data"
+
+perf record --call-graph fp -F 999 -o "$data" -- "$benchmark" "$@"
+perf script -i "$data" | stackcollapse-perf.pl | flamegraph.pl --title "orb_benchmark" > "$output"
+echo "Flame graph written to $output"
@@ -0,0 +1,163 @@
+#include "BenchmarkS.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace {
+
+class Echo_i : public virtual POA_Benchmark::Echo {
+public:
+    Benchmark::Payload* echo(const Benchmark::Payload& data) override {
+        return new Benchmark::Payload(data);
+    }
+};
+
+struct Result {
+    std::string mode;
+    CORBA::ULong payload_bytes;
+    int iterations;
+    double p50_us;
+    double p99_us;
+    double requests_per_second;
+};
+
+Result measure(const std::string& mode, Benchmark::Echo_ptr echo, CORBA::ULong size, int iterations) {
+    Benchmark::Payload payload(size);
+    payload.length(size);
+    std::memset(payload.get_buffer(), 0x5a, size);
+
+    for (int i = 0; i < iterations / 10; ++i) {
+        Benchmark::Payload_var reply = echo->echo(payload);
+    }
+
+    std::vector<double> latencies;
+    latencies.reserve(iterations);
+    auto const start = std::chrono::steady_clock::now();
+    for (int i = 0; i < iterations; ++i) {
+        auto const before = std::chrono::steady_clock::now();
+        Benchmark::Payload_var reply = echo->echo(payload);
+        auto const after = std::chrono::steady_clock::now();
+        latencies.push_back(std::chrono::duration<double, std::micro>(after - before).count());
+    }
+    std::chrono::duration<double> const elapsed = std::chrono::steady_clock::now() - start;
+
+    std::sort(latencies.begin(), latencies.end());
+    auto percentile = [&latencies](double p) {
+        return latencies[static_cast<std::size_t>(p * (latencies.size() - 1))];
+    };
+    return {mode, size, iterations, percentile(0.50), percentile(0.99), iterations / elapsed.count()};
+}
+
+void write_results(const std::string& path, const std::vector<Result>& results) {
+    std::ofstream out(path);
+    out << "{\n  \"results\": [\n";
+    for (std::size_t i = 0; i < results.size(); ++i) {
+        const Result& r = results[i];
+        out << "    {\"mode\": \"" << r.mode << "\", \"payload_bytes\": " << r.payload_bytes
+            << ", \"iterations\": " << r.iterations << ", \"p50_us\": " << r.p50_us
+            << ", \"p99_us\": " << r.p99_us << ", \"requests_per_second\": " << r.requests_per_second
+            << "}" << (i + 1 < results.size() ? "," : "") << "\n";
+    }
+    out << "  ]\n}\n";
+}
+
+}  // namespace
+
+// Measures round trips to an echo servant, once over loopback IIOP from a
+// second ORB that has collocation disabled, and once collocated. With
+// --server-threads 0 the main thread drives both ORBs, and the second ORB
+// serves the IIOP requests itself, for builds without threads.
+//
+// Usage: orb_benchmark [-ORB...] [--iterations N] [--server-threads N]
+//                      [--output results.json]
+int main(int argc, char* argv[]) {
+    try {
+        CORBA::ORB_var server_orb = CORBA::ORB_init(argc, argv, "server");
+
+        int iterations = 10000;
+        int server_threads = 1;
+        std::string output = "orb_benchmark.json";
+        for (int i = 1; i + 1 < argc; i += 2) {
+            if (std::strcmp(argv[i], "--iterations") == 0) {
+                iterations = std::atoi(argv[i + 1]);
+            } else if (std::strcmp(argv[i], "--server-threads") == 0) {
+                server_threads = std::max(0, std::atoi(argv[i + 1]));
+            } else if (std::strcmp(argv[i], "--output") == 0) {
+                output = argv[i + 1];
+            }
+        }
+        if (iterations < 1) {
+            std::cerr << "orb_benchmark: --iterations needs a positive number\n";
+            server_orb->destroy();
+            return 1;
+        }
+
+        CORBA::Object_var obj = server_orb->resolve_initial_references("RootPOA");
+        PortableServer::POA_var root_poa = PortableServer::POA::_narrow(obj.in());
+        PortableServer::POAManager_var poa_manager = root_poa->the_POAManager();
+        PortableServer::Servant_var<Echo_i> servant = new Echo_i();
+        PortableServer::ObjectId_var id = root_poa->activate_object(servant.in());
+        obj = root_poa->id_to_reference(id.in());
+        CORBA::String_var ior = server_orb->object_to_string(obj.in());
+        Benchmark::Echo_var collocated = Benchmark::Echo::_narrow(obj.in());
+        poa_manager->activate();
+
+        std::vector<std::thread> server_pool;
+        for (int i = 0; i < server_threads; ++i) {
+            server_pool.emplace_back([&server_orb] { server_orb->run(); });
+        }
+
+        int client_argc = 3;
+        char client_arg0[] = "orb_benchmark";
+        char client_arg1[] = "-ORBCollocation";
+        char client_arg2[] = "no";
+        char* client_argv[] = {client_arg0, client_arg1, client_arg2, nullptr};
+        CORBA::ORB_var client_orb = CORBA::ORB_init(client_argc, client_argv, "client");
+        PortableServer::Servant_var<Echo_i> client_servant;
+        if (server_threads == 0) {
+            // The client ORB dispatches the requests to its own servant while
+            // it waits for the replies, so no thread runs the server ORB.
+            obj = client_orb->resolve_initial_references("RootPOA");
+            PortableServer::POA_var client_poa = PortableServer::POA::_narrow(obj.in());
+            client_servant = new Echo_i();
+            PortableServer::ObjectId_var client_id = client_poa->activate_object(client_servant.in());
+            obj = client_poa->id_to_reference(client_id.in());
+            ior = client_orb->object_to_string(obj.in());
+            PortableServer::POAManager_var client_poa_manager = client_poa->the_POAManager();
+            client_poa_manager->activate();
+        }
+        obj = client_orb->string_to_object(ior.in());
+        Benchmark::Echo_var remote = Benchmark::Echo::_narrow(obj.in());
+
+        std::vector<Result> results;
+        for (CORBA::ULong size : {0u, 64u, 1024u, 16384u, 65536u}) {
+            results.push_back(measure("iiop", remote.in(), size, iterations));
+            results.push_back(measure("collocated", collocated.in(), size, iterations));
+        }
+
+        remote = Benchmark::Echo::_nil();
+        client_orb->destroy();
+        server_orb->shutdown(true);
+        for (std::thread& thread : server_pool) {
+            thread.join();
+        }
+        root_poa->destroy(true, true);
+        server_orb->destroy();
+
+        for (const Result& r : results) {
+            std::cout << r.mode << " " << r.payload_bytes << " bytes: p50 " << r.p50_us
+                      << " us, p99 " << r.p99_us << " us, " << r.requests_per_second << " requests/s\n";
+        }
+        write_results(output, results);
+    } catch (const CORBA::Exception& ex) {
+        ex._tao_print_exception("orb_benchmark:");
+        return 1;
+    }
+}
@@ -0,0 +1,70 @@
+#include <tao/ORB.h>
+#include <tao/PortableServer/PortableServer.h>
+
+#include <chrono>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <string>
+
+namespace {
+
+// Reads a memory counter of this process from /proc/self/status, in kB.
+long proc_status_kb(const char* field) {
+    std::ifstream status("/proc/self/status");
+    std::string line;
+    std::size_t const length = std::strlen(field);
+    while (std::getline(status, line)) {
+        if (line.compare(0, length, field) == 0 && line[length] == ':') {
+            return std::stol(line.substr(length + 1));
+        }
+    }
+    return -1;
+}
+
+}  // namespace
+
+// Measures the startup cost of a server ORB: the time ORB_init takes, the
+// time until the RootPOA is active, and the resident memory afterwards.
+//
+// Usage: orb_footprint [-ORB...] [--output footprint.json]
+int main(int argc, char* argv[]) {
+    try {
+        long const rss_before_kb = proc_status_kb("VmRSS");
+        auto const start = std::chrono::steady_clock::now();
+        CORBA::ORB_var orb = CORBA::ORB_init(argc, argv);
+        auto const initialized = std::chrono::steady_clock::now();
+
+        CORBA::Object_var obj = orb->resolve_initial_references("RootPOA");
+        PortableServer::POA_var root_poa = PortableServer::POA::_narrow(obj.in());
+        PortableServer::POAManager_var poa_manager = root_poa->the_POAManager();
+        poa_manager->activate();
+        auto const activated = std::chrono::steady_clock::now();
+
+        std::string output = "orb_footprint.json";
+        for (int i = 1; i + 1 < argc; i += 2) {
+            if (std::strcmp(argv[i], "--output") == 0) {
+                output = argv[i + 1];
+            }
+        }
+
+        double const orb_init_ms = std::chrono::duration<double, std::milli>(initialized - start).count();
+        double const poa_ready_ms = std::chrono::duration<double, std::milli>(activated - start).count();
+        long const rss_kb = proc_status_kb("VmRSS");
+        long const peak_rss_kb = proc_status_kb("VmHWM");
+
+        root_poa->destroy(true, true);
+        orb->destroy();
+
+        std::cout << "ORB_init " << orb_init_ms << " ms, RootPOA active after " << poa_ready_ms
+                  << " ms, RSS " << rss_kb << " kB (" << rss_kb - rss_before_kb << " kB for the ORB), peak "
+                  << peak_rss_kb << " kB\n";
+        std::ofstream out(output);
+        out << "{\"orb_init_ms\": " << orb_init_ms << ", \"poa_ready_ms\": " << poa_ready_ms
+            << ", \"rss_kb\": " << rss_kb << ", \"orb_rss_kb\": " << rss_kb - rss_before_kb
+            << ", \"peak_rss_kb\": " << peak_rss_kb << "}\n";
+    } catch (const CORBA::Exception& ex) {
+        ex._tao_print_exception("orb_footprint:");
+        return 1;
+    }
+}
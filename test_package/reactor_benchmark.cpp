@@ -0,0 +1,113 @@
+#include <ace/Event_Handler.h>
+#include <ace/OS_NS_unistd.h>
+#include <ace/Pipe.h>
+#include <ace/Reactor.h>
+#include <ace/Select_Reactor.h>
+
+#include <algorithm>
+#include <chrono>
+#include <cstdlib>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <memory>
+#include <string>
+#include <vector>
+
+namespace {
+
+// Passes every byte it reads on to the next pipe of a ring, so the reactor
+// always has input to dispatch.
+class Relay : public ACE_Event_Handler {
+public:
+    Relay(ACE_HANDLE input, ACE_HANDLE output, long& dispatches)
+        : input_(input), output_(output), dispatches_(dispatches) {}
+
+    int handle_input(ACE_HANDLE) override {
+        char token;
+        if (ACE_OS::read(input_, &token, 1) != 1 || ACE_OS::write(output_, &token, 1) != 1) {
+            return -1;
+        }
+        ++dispatches_;
+        return 0;
+    }
+
+    ACE_HANDLE get_handle() const override { return input_; }
+
+private:
+    ACE_HANDLE input_;
+    ACE_HANDLE output_;
+    long& dispatches_;
+};
+
+}  // namespace
+
+// Measures how many I/O events a select reactor dispatches per second. The
+// reactor locks its token around every dispatch, unless ACE is built without
+// threads (ACE_MT_SAFE 0).
+//
+// Usage: reactor_benchmark [--seconds N] [--handlers N] [--output results.json]
+int main(int argc, char* argv[]) {
+    double seconds = 2.0;
+    int handlers = 16;
+    std::string output = "reactor_benchmark.json";
+    for (int i = 1; i + 1 < argc; i += 2) {
+        if (std::strcmp(argv[i], "--seconds") == 0) {
+            seconds = std::atof(argv[i + 1]);
+        } else if (std::strcmp(argv[i], "--handlers") == 0) {
+            handlers = std::max(2, std::atoi(argv[i + 1]));
+        } else if (std::strcmp(argv[i], "--output") == 0) {
+            output = argv[i + 1];
+        }
+    }
+
+    ACE_Select_Reactor select_reactor;
+    ACE_Reactor reactor(&select_reactor);
+    long dispatches = 0;
+    std::vector<ACE_Pipe> pipes(handlers);
+    std::vector<std::unique_ptr<Relay>> relays;
+    for (ACE_Pipe& pipe : pipes) {
+        if (pipe.open() == -1) {
+            std::cerr << "reactor_benchmark: cannot open pipes\n";
+            return 1;
+        }
+    }
+    for (int i = 0; i < handlers; ++i) {
+        relays.emplace_back(new Relay(pipes[i].read_handle(), pipes[(i + 1) % handlers].write_handle(), dispatches));
+        reactor.register_handler(relays.back().get(), ACE_Event_Handler::READ_MASK);
+    }
+    // A token per second pipe keeps half of the handlers ready at any time.
+    for (int i = 0; i < handlers; i += 2) {
+        ACE_OS::write(pipes[i].write_handle(), "x", 1);
+    }
+
+    auto const start = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed{};
+    while (elapsed.count() < seconds) {
+        ACE_Time_Value timeout(1);
+        if (reactor.handle_events(timeout) == -1) {
+            std::cerr << "reactor_benchmark: dispatching failed\n";
+            return 1;
+        }
+        elapsed = std::chrono::steady_clock::now() - start;
+    }
+
+    for (std::unique_ptr<Relay>& relay : relays) {
+        reactor.remove_handler(relay.get(), ACE_Event_Handler::READ_MASK | ACE_Event_Handler::DONT_CALL);
+    }
+    for (ACE_Pipe& pipe : pipes) {
+        pipe.close();
+    }
+
+#if defined(ACE_MT_SAFE) && (ACE_MT_SAFE != 0)
+    char const* const threads = "true";
+#else
+    char const* const threads = "false";
+#endif
+    double const rate = dispatches / elapsed.count();
+    std::cout << "threads=" << threads << ": " << dispatches << " dispatches in " << elapsed.count() << " s, "
+              << rate << " dispatches/s\n";
+    std::ofstream out(output);
+    out << "{\"threads\": " << threads << ", \"handlers\": " << handlers << ", \"dispatches\": " << dispatches
+        << ", \"seconds\": " << elapsed.count() << ", \"dispatches_per_second\": " << rate << "}\n";
+}
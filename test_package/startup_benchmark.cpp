@@ -0,0 +1,68 @@
+#include <tao/ORB.h>
+
+#include <dlfcn.h>
+
+#include <chrono>
+#include <cstring>
+#include <fstream>
+#include <iostream>
+#include <string>
+#include <utility>
+#include <vector>
+
+// Measures the startup work the dynamic linker and the ORB do: the time
+// ORB_init takes, then the time dlopen takes to load and relocate each of
+// the given libraries, the way the service configurator loads services.
+// A library shares the dependencies already loaded by the ones before it.
+//
+// Usage: startup_benchmark [-ORB...] [--library libTAO_X.so]... [--output results.json]
+int main(int argc, char* argv[]) {
+    try {
+        auto const start = std::chrono::steady_clock::now();
+        CORBA::ORB_var orb = CORBA::ORB_init(argc, argv);
+        double const orb_init_ms =
+            std::chrono::duration<double, std::milli>(std::chrono::steady_clock::now() - start).count();
+
+        std::vector<std::string> libraries;
+        std::string output = "startup_benchmark.json";
+        for (int i = 1; i + 1 < argc; i += 2) {
+            if (std::strcmp(argv[i], "--library") == 0) {
+                libraries.emplace_back(argv[i + 1]);
+            } else if (std::strcmp(argv[i], "--output") == 0) {
+                output = argv[i + 1];
+            }
+        }
+
+        std::vector<std::pair<std::string, double>> dlopen_ms;
+        std::vector<void*> handles;
+        for (const std::string& library : libraries) {
+            auto const before = std::chrono::steady_clock::now();
+            void* handle = dlopen(library.c_str(), RTLD_NOW | RTLD_GLOBAL);
+            auto const after = std::chrono::steady_clock::now();
+            if (handle == nullptr) {
+                std::cerr << "startup_benchmark: " << dlerror() << "\n";
+                return 1;
+            }
+            handles.push_back(handle);
+            dlopen_ms.emplace_back(library, std::chrono::duration<double, std::milli>(after - before).count());
+        }
+
+        orb->destroy();
+        for (void* handle : handles) {
+            dlclose(handle);
+        }
+
+        std::cout << "ORB_init " << orb_init_ms << " ms\n";
+        std::ofstream out(output);
+        out << "{\n  \"orb_init_ms\": " << orb_init_ms << ",\n  \"dlopen\": [\n";
+        for (std::size_t i = 0; i < dlopen_ms.size(); ++i) {
+            std::cout << "dlopen " << dlopen_ms[i].first << " " << dlopen_ms[i].second << " ms\n";
+            out << "    {\"library\": \"" << dlopen_ms[i].first << "\", \"ms\": " << dlopen_ms[i].second << "}"
+                << (i + 1 < dlopen_ms.size() ? "," : "") << "\n";
+        }
+        out << "  ]\n}\n";
+    } catch (const CORBA::Exception& ex) {
+        ex._tao_print_exception("startup_benchmark:");
+        return 1;
+    }
+}